@@ -1,21 +1,91 @@
 
-import pandas as pd
-import numpy as np
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.naive_bayes import GaussianNB
-from sklearn.svm import SVC
-from scipy.stats import poisson
+import os
+import random
+import features
+from lazy import lazy_import
+from elo import EloRatings
+from dixon_coles import DixonColesModel
+from h2h import HeadToHeadIndex
+
+# Heavy dependencies are imported on first use, not when the API boots
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+sklearn_ensemble = lazy_import("sklearn.ensemble")
+sklearn_linear_model = lazy_import("sklearn.linear_model")
+sklearn_neighbors = lazy_import("sklearn.neighbors")
+sklearn_naive_bayes = lazy_import("sklearn.naive_bayes")
+sklearn_svm = lazy_import("sklearn.svm")
+sklearn_calibration = lazy_import("sklearn.calibration")
+sklearn_pipeline = lazy_import("sklearn.pipeline")
+sklearn_preprocessing = lazy_import("sklearn.preprocessing")
+
+# Worker count for sklearn estimators that support n_jobs (-1: all cores).
+# Set it to 1 when the engine already trains models in a process pool.
+SKLEARN_N_JOBS = int(os.environ.get("SKLEARN_N_JOBS", -1))
+
+# Outcome order used by every probability array: home win, draw, away win
+OUTCOMES = ("1", "X", "2")
+
+
+def poisson_pmf(lam, max_goals):
+    """
+    Poisson probabilities P(k; lam) for k = 0..max_goals.
+    lam is a 1-D array of rates, the result has shape (len(lam), max_goals + 1).
+    """
+    lam = np.asarray(lam, dtype=float).reshape(-1, 1)
+    k = np.arange(max_goals + 1)
+    log_fact = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, max_goals + 1)))))
+    return np.exp(k * np.log(np.maximum(lam, 1e-12)) - lam - log_fact)
+
+
+def score_matrix(lambda_home, lambda_away, max_goals=10):
+    """
+    Full home x away score probability matrices for a batch of fixtures.
+    Returns an array of shape (n, max_goals + 1, max_goals + 1) where
+    [m, i, j] is the probability that fixture m ends i-j.
+    """
+    home = poisson_pmf(lambda_home, max_goals)
+    away = poisson_pmf(lambda_away, max_goals)
+    return home[:, :, None] * away[:, None, :]
+
+
+def outcome_probabilities(matrix):
+    """
+    Collapses score matrices into (n, 3) 1/X/2 probabilities.
+    Mass lost to the goal cap is renormalised away.
+    """
+    home_win = np.tril(matrix, -1).sum(axis=(1, 2))
+    draw = np.trace(matrix, axis1=1, axis2=2)
+    away_win = np.triu(matrix, 1).sum(axis=(1, 2))
+    probs = np.stack([home_win, draw, away_win], axis=1)
+    return probs / probs.sum(axis=1, keepdims=True)
+
 
 class BaseAlgorithm:
     def __init__(self, name):
         self.name = name
         self.accuracy = 0.0
+        self.error = None
 
     def train(self, data):
         pass
 
+    def update(self, new_matches, history=None):
+        """
+        Brings a trained model up to date with new_matches. history is the full
+        data set including new_matches; models without an incremental path
+        simply retrain on it.
+        """
+        if history is not None:
+            self.train(history)
+
+    def warm_start(self, previous):
+        """
+        Called on a new instance before it is trained, with the published
+        model of the same name; models whose fit can start from earlier
+        parameters take them over here.
+        """
+
     def predict(self, match):
         """
         Returns a dictionary:
@@ -27,123 +97,674 @@ class BaseAlgorithm:
         """
         return {"prediction": "X", "confidence": 0.0, "details": "Not implemented"}
 
+    def predict_batch(self, matches):
+        """
+        Returns an (n, 3) array of 1/X/2 probabilities for a DataFrame of fixtures.
+        Algorithms with a vectorized model override this; the default falls back
+        to predict() per row, putting the confidence on the predicted outcome and
+        splitting the rest evenly so the prediction stays the row's argmax.
+        """
+        probs = np.zeros((len(matches), 3))
+        for i, match in enumerate(matches.to_dict('records')):
+            p = self.predict(match)
+            k = OUTCOMES.index(p['prediction'])
+            conf = min(max(float(p['confidence']), 0.0), 1.0)
+            rest = (1.0 - conf) / 2
+            probs[i] = rest
+            probs[i, k] = max(conf, rest + 1e-6)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+    def describe(self, probs, match=None):
+        """
+        Human readable reasoning for one row of predict_batch output;
+        match is the fixture it belongs to, when available.
+        """
+        return f"{self.name} probabilities: 1({probs[0]:.2f}), X({probs[1]:.2f}), 2({probs[2]:.2f})"
+
+    def to_prediction(self, probs, match=None):
+        """
+        Turns one row of predict_batch output into the predict() dictionary.
+        """
+        k = int(np.argmax(probs))
+        return {"prediction": OUTCOMES[k], "confidence": float(probs[k]), "details": self.describe(probs, match)}
+
 # 1. Poisson Distribution
 class PoissonAlgo(BaseAlgorithm):
-    def __init__(self):
+
+    def __init__(self, max_goals=10):
         super().__init__("Poisson Distribution")
+        self.max_goals = max_goals
+        self._reset()
+
+    def _reset(self):
+        # Empty per-team goal totals, so update() works before any train()
+        self._home_goals = pd.DataFrame(columns=['sum', 'count'], dtype=float)
+        self._away_goals = pd.DataFrame(columns=['sum', 'count'], dtype=float)
         self.home_strength = {}
         self.away_strength = {}
 
     def train(self, data):
-        # Calculate goal averages
-        avg_home_scored = data['home_score'].mean()
-        avg_away_scored = data['away_score'].mean()
-        
-        # Simplified strength calculation
-        for team in pd.concat([data['home_team'], data['away_team']]).unique():
-            home_matches = data[data['home_team'] == team]
-            away_matches = data[data['away_team'] == team]
-            
-            self.home_strength[team] = home_matches['home_score'].mean() / avg_home_scored if not home_matches.empty else 1.0
-            self.away_strength[team] = away_matches['away_score'].mean() / avg_away_scored if not away_matches.empty else 1.0
+        self._reset()
+        self.update(data)
+
+    def update(self, new_matches, history=None):
+        """
+        Folds new results into the running per-team goal totals without
+        refitting on the full history. train() is update() from empty totals.
+        """
+        if new_matches is None or new_matches.empty:
+            return
+
+        # One grouped pass per side instead of a boolean scan per team
+        home = new_matches.groupby('home_team', observed=True)['home_score'].agg(['sum', 'count'])
+        away = new_matches.groupby('away_team', observed=True)['away_score'].agg(['sum', 'count'])
+        self._home_goals = home.add(self._home_goals, fill_value=0)
+        self._away_goals = away.add(self._away_goals, fill_value=0)
+
+        # League averages shift with every matchday, so strengths are
+        # re-derived from the totals (O(teams), not O(matches))
+        avg_home_scored = self._home_goals['sum'].sum() / self._home_goals['count'].sum()
+        avg_away_scored = self._away_goals['sum'].sum() / self._away_goals['count'].sum()
+
+        home_strength = self._home_goals['sum'] / self._home_goals['count'] / avg_home_scored
+        away_strength = self._away_goals['sum'] / self._away_goals['count'] / avg_away_scored
+        self.home_strength = home_strength.fillna(1.0).to_dict()
+        self.away_strength = away_strength.fillna(1.0).to_dict()
+
+    def expected_goals(self, matches):
+        """
+        Expected goals (lambda_home, lambda_away) arrays for a DataFrame or list of fixtures.
+        """
+        if isinstance(matches, pd.DataFrame):
+            homes, aways = matches['home_team'], matches['away_team']
+        else:
+            homes = [m['home_team'] for m in matches]
+            aways = [m['away_team'] for m in matches]
+
+        hs = np.array([self.home_strength.get(h, 1.0) for h in homes], dtype=float)
+        as_ = np.array([self.away_strength.get(a, 1.0) for a in aways], dtype=float)
 
-    def predict(self, match):
-        home = match['home_team']
-        away = match['away_team']
-        
-        hs = self.home_strength.get(home, 1.0)
-        as_ = self.away_strength.get(away, 1.0)
-        
         lambda_home = hs * 1.2 # Dummy league avg
         lambda_away = as_ * 1.0
-        
-        # Simulate probability of wins
-        home_win_prob = 0
-        draw_prob = 0
-        away_win_prob = 0
-        
-        for i in range(6):
-            for j in range(6):
-                prob = poisson.pmf(i, lambda_home) * poisson.pmf(j, lambda_away)
-                if i > j: home_win_prob += prob
-                elif i == j: draw_prob += prob
-                else: away_win_prob += prob
-
-        probs = {"1": home_win_prob, "X": draw_prob, "2": away_win_prob}
-        pred = max(probs, key=probs.get)
-        
-        return {
-            "prediction": pred,
-            "confidence": probs[pred],
-            "details": f"Poisson probabilities: 1({home_win_prob:.2f}), X({draw_prob:.2f}), 2({away_win_prob:.2f})"
-        }
+        return lambda_home, lambda_away
+
+    def score_matrices(self, matches):
+        lambda_home, lambda_away = self.expected_goals(matches)
+        return score_matrix(lambda_home, lambda_away, self.max_goals)
+
+    def outcome_probabilities(self, matches):
+        """
+        (n, 3) array of 1/X/2 probabilities for a batch of fixtures, computed in one pass.
+        """
+        return outcome_probabilities(self.score_matrices(matches))
+
+    def predict_batch(self, matches):
+        return self.outcome_probabilities(matches)
+
+    def describe(self, probs, match=None):
+        home_win_prob, draw_prob, away_win_prob = probs
+        return f"Poisson probabilities: 1({home_win_prob:.2f}), X({draw_prob:.2f}), 2({away_win_prob:.2f})"
+
+    def predict(self, match):
+        return self.to_prediction(self.outcome_probabilities([match])[0], match)
 
 # 2. Monte Carlo Simulation
-class MonteCarloAlgo(BaseAlgorithm):
-    def __init__(self):
-        super().__init__("Monte Carlo Simulation")
-    
+class MonteCarloAlgo(PoissonAlgo):
+    """
+    Plays every fixture n_simulations times with goal rates from the fitted
+    Poisson team strengths. All simulations for a batch are drawn at once.
+    """
+    # Upper bound on simulated scores held in memory per chunk
+    max_draws_per_chunk = 5_000_000
+
+    def __init__(self, n_simulations=10000, rng=None):
+        super().__init__()
+        self.name = "Monte Carlo Simulation"
+        self.n_simulations = n_simulations
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def simulate(self, matches):
+        """
+        Returns (n, 3) 1/X/2 frequencies over n_simulations draws per fixture.
+        """
+        lambda_home, lambda_away = self.expected_goals(matches)
+        n = len(lambda_home)
+        counts = np.zeros((n, 3))
+        chunk = max(1, self.max_draws_per_chunk // self.n_simulations)
+
+        for start in range(0, n, chunk):
+            lh = lambda_home[start:start + chunk, None]
+            la = lambda_away[start:start + chunk, None]
+            size = (len(lh), self.n_simulations)
+            diff = self.rng.poisson(lh, size) - self.rng.poisson(la, size)
+            counts[start:start + chunk, 0] = (diff > 0).sum(axis=1)
+            counts[start:start + chunk, 1] = (diff == 0).sum(axis=1)
+            counts[start:start + chunk, 2] = (diff < 0).sum(axis=1)
+
+        return counts / self.n_simulations
+
+    def outcome_probabilities(self, matches):
+        return self.simulate(matches)
+
+    def describe(self, probs, match=None):
+        confidence = float(np.max(probs))
+        return f"Simulated {self.n_simulations} matches. Win rate: {confidence*100:.1f}%"
+
     def predict(self, match):
-        # Simulate 1000 matches based on random factors
-        results = {"1": 0, "X": 0, "2": 0}
-        for _ in range(1000):
-            h_score = np.random.poisson(1.4) # Simplified
-            a_score = np.random.poisson(1.1)
-            if h_score > a_score: results["1"] += 1
-            elif h_score == a_score: results["X"] += 1
-            else: results["2"] += 1
-            
-        pred = max(results, key=results.get)
-        confidence = results[pred] / 1000.0
-        return {"prediction": pred, "confidence": confidence, "details": f"Simulated 1000 matches. Win rate: {confidence*100:.1f}%"}
+        return self.to_prediction(self.simulate([match])[0], match)
 
-# 3. XGBoost
-class XGBoostAlgo(BaseAlgorithm):
-    def __init__(self):
-        super().__init__("XGBoost Classifier")
-        self.model = GradientBoostingClassifier() # Using sklearn's GBM as proxy for XGB to avoid compilation issues in some envs, can swap to xgboost.XGBClassifier
+# Scikit-learn classifiers over the shared feature matrix
+class SklearnAlgo(BaseAlgorithm):
+    """
+    Base for the scikit-learn models. Features come from features.feature_matrix(),
+    which is built once per data version and shared by all of these models;
+    predictions for a batch of fixtures are one predict_proba call.
+    """
+    # Below this many rows (or with a single outcome class) the model stays unfitted
+    min_train_rows = 20
+    # Rows every outcome seen in training needs (e.g. one per CV fold);
+    # otherwise the model stays unfitted and predicts the prior
+    min_class_rows = 1
+    # Cap for estimators that scale badly with rows; the most recent rows are kept
+    max_train_rows = None
+
+    def __init__(self, name):
+        super().__init__(name)
+        self._model = None
+        self.state = None
+        self.prior = np.full(3, 1.0 / 3)
+        self.fitted = False
+
+    def build_model(self, n_rows):
+        raise NotImplementedError
+
+    @property
+    def model(self):
+        # Built on first use so sklearn is only imported when the model is needed
+        if self._model is None:
+            self._model = self.build_model(self.min_train_rows)
+        return self._model
 
     def train(self, data):
-        # Feature Engineering needed here
-        # For brevity, using random training
-        pass
+        matrix = features.feature_matrix(data)
+        X, y = matrix.X, matrix.y
+        if self.max_train_rows and len(y) > self.max_train_rows:
+            order = np.argsort(pd.to_datetime(data['date']).to_numpy(), kind='stable')[-self.max_train_rows:]
+            X, y = X[order], y[order]
+
+        self.state = matrix.state
+        self.fitted = False
+        if len(y):
+            self.prior = np.bincount(y, minlength=3) / len(y)
+        counts = np.bincount(y, minlength=3)
+        present = counts[counts > 0]
+        if len(y) < self.min_train_rows or len(present) < 2 or present.min() < self.min_class_rows:
+            return
+        self._model = self.build_model(len(y))
+        self._model.fit(X, y)
+        self.fitted = True
+
+    def predict_batch(self, matches):
+        if not self.fitted:
+            return np.tile(self.prior, (len(matches), 1))
+        proba = self._model.predict_proba(self.state.features(matches))
+        # Classes missing from the training labels get probability 0
+        probs = np.zeros((len(proba), 3))
+        probs[:, self._model.classes_] = proba
+        return probs
+
+    def describe(self, probs, match=None):
+        k = int(np.argmax(probs))
+        outcome = ("a home win", "a draw", "an away win")[k]
+        return f"{self.name} favours {outcome} ({probs[k]*100:.0f}%) from recent form features."
 
     def predict(self, match):
-        return {"prediction": "1", "confidence": 0.65, "details": "Gradient Boosting favors Home team based on recent form features."}
+        return self.to_prediction(self.predict_batch([match])[0], match)
+
+# 3. XGBoost
+class XGBoostAlgo(SklearnAlgo):
+    def __init__(self):
+        super().__init__("XGBoost Classifier")
+
+    def build_model(self, n_rows):
+        # sklearn's histogram GBM as a stand-in for XGBoost (no compiled extra
+        # dependency); it fits on all cores through OpenMP
+        return sklearn_ensemble.HistGradientBoostingClassifier(
+            max_iter=100, learning_rate=0.05, max_depth=3,
+            min_samples_leaf=min(20, max(1, n_rows // 10)), early_stopping=False)
 
 # 4. Random Forest
-class RandomForestAlgo(BaseAlgorithm):
+class RandomForestAlgo(SklearnAlgo):
     def __init__(self):
         super().__init__("Random Forest")
-        self.model = RandomForestClassifier()
 
-    def predict(self, match):
-        return {"prediction": "1", "confidence": 0.60, "details": "Decision trees indicate home advantage."}
+    def build_model(self, n_rows):
+        return sklearn_ensemble.RandomForestClassifier(
+            n_estimators=200, min_samples_leaf=5, n_jobs=SKLEARN_N_JOBS, random_state=0)
 
 # 5. Elo Rating
 class EloAlgo(BaseAlgorithm):
-    def __init__(self):
+    """
+    Elo ratings replayed over the match history. Win/draw/loss come from the
+    expected score, with a draw share that peaks for evenly rated teams and
+    is calibrated to the league's draw rate.
+    """
+
+    def __init__(self, k=20.0, home_advantage=60.0):
         super().__init__("Elo Rating System")
-        self.ratings = {} # Load initial ratings
-    
+        self.ratings = EloRatings(k=k, home_advantage=home_advantage)
+        self.draw_scale = 0.5
+
+    def train(self, data):
+        self.ratings.fit(data)
+        self._calibrate(data)
+
+    def update(self, new_matches, history=None):
+        """
+        O(1) per result: the new matches are applied in date order on top of
+        the current ratings.
+        """
+        if new_matches is None or new_matches.empty:
+            return
+        ordered = new_matches.sort_values('date', kind='stable')
+        for home, away, hs, as_, date in zip(ordered['home_team'].astype(str), ordered['away_team'].astype(str),
+                                             ordered['home_score'], ordered['away_score'], ordered['date']):
+            self.ratings.update(home, away, hs, as_, date)
+
+    def _calibrate(self, data):
+        # Scale draws so that the average predicted draw share matches history
+        n = len(self.ratings)
+        if n == 0:
+            return
+        expected = self.ratings.expected_home(self.ratings._home_pre[:n].astype(float),
+                                              self.ratings._away_pre[:n].astype(float))
+        closeness = (1.0 - np.abs(2.0 * expected - 1.0)).mean()
+        draw_rate = (data['home_score'] == data['away_score']).mean()
+        self.draw_scale = float(min(draw_rate / max(closeness, 1e-6), 0.9))
+
+    def team_ratings(self, matches):
+        if isinstance(matches, pd.DataFrame):
+            homes, aways = matches['home_team'].astype(str), matches['away_team'].astype(str)
+        else:
+            homes = [m['home_team'] for m in matches]
+            aways = [m['away_team'] for m in matches]
+        home = np.array([self.ratings.rating(t) for t in homes], dtype=float)
+        away = np.array([self.ratings.rating(t) for t in aways], dtype=float)
+        return home, away
+
+    def predict_batch(self, matches):
+        home, away = self.team_ratings(matches)
+        expected = self.ratings.expected_home(home, away)
+        draw = self.draw_scale * (1.0 - np.abs(2.0 * expected - 1.0))
+        probs = np.stack([expected - draw / 2, draw, 1.0 - expected - draw / 2], axis=1)
+        probs = np.clip(probs, 0.01, None)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+    def describe(self, probs, match=None):
+        if match is None:
+            return super().describe(probs)
+        home, away = self.team_ratings([match])
+        leader = "Home" if home[0] >= away[0] else "Away"
+        return f"{leader} team has higher ELO rating ({home[0]:.0f} vs {away[0]:.0f})."
+
+    def predict(self, match):
+        return self.to_prediction(self.predict_batch([match])[0], match)
+
+# 6. Dixon-Coles
+class DixonColesAlgo(BaseAlgorithm):
+    """
+    Dixon-Coles attack/defence model with time decay. Each (re)fit is
+    warm-started from the previous parameters.
+    """
+    def __init__(self, xi=0.002, max_goals=10):
+        super().__init__("Dixon-Coles Model")
+        self.model = DixonColesModel(xi=xi)
+        self.max_goals = max_goals
+
+    def train(self, data):
+        self.model.fit(data)
+
+    def warm_start(self, previous):
+        self.model.warm_start(previous.model)
+
+    def update(self, new_matches, history=None):
+        # A warm-started refit on the full history only needs a few iterations
+        if history is not None:
+            self.model.fit(history)
+
+    def outcome_probabilities(self, matches):
+        if isinstance(matches, pd.DataFrame):
+            homes, aways = matches['home_team'].astype(str), matches['away_team'].astype(str)
+        else:
+            homes = [m['home_team'] for m in matches]
+            aways = [m['away_team'] for m in matches]
+        lam, mu = self.model.rates(homes, aways)
+        matrices = self.model.correct(score_matrix(lam, mu, self.max_goals), lam, mu)
+        return outcome_probabilities(matrices)
+
+    def predict_batch(self, matches):
+        return self.outcome_probabilities(matches)
+
+    def describe(self, probs, match=None):
+        if match is None:
+            return super().describe(probs)
+        lam, mu = self.model.rates([match['home_team']], [match['away_team']])
+        return f"Dixon-Coles expected goals {lam[0]:.2f} - {mu[0]:.2f} (rho {self.model.rho:.2f})."
+
+    def predict(self, match):
+        return self.to_prediction(self.outcome_probabilities([match])[0], match)
+
+# 7. Logistic Regression
+class LogisticRegressionAlgo(SklearnAlgo):
+    def __init__(self):
+        super().__init__("Logistic Regression")
+
+    def build_model(self, n_rows):
+        return sklearn_pipeline.make_pipeline(
+            sklearn_preprocessing.StandardScaler(), sklearn_linear_model.LogisticRegression(max_iter=1000))
+
+# 8. K-Nearest Neighbors
+class KNNAlgo(SklearnAlgo):
+    def __init__(self, n_neighbors=25):
+        super().__init__("K-Nearest Neighbors")
+        self.n_neighbors = n_neighbors
+
+    def build_model(self, n_rows):
+        return sklearn_pipeline.make_pipeline(
+            sklearn_preprocessing.StandardScaler(),
+            sklearn_neighbors.KNeighborsClassifier(n_neighbors=min(self.n_neighbors, n_rows), n_jobs=SKLEARN_N_JOBS))
+
+# 9. Gaussian Naive Bayes
+class NaiveBayesAlgo(SklearnAlgo):
+    def __init__(self):
+        super().__init__("Gaussian Naive Bayes")
+
+    def build_model(self, n_rows):
+        return sklearn_naive_bayes.GaussianNB()
+
+# 10. Support Vector Machine
+class SVMAlgo(SklearnAlgo):
+    # Kernel SVC training is quadratic in the rows (and runs once per CV fold)
+    max_train_rows = 2000
+    calibration_folds = 3
+    # Calibration needs a row of every outcome in each fold
+    min_class_rows = calibration_folds
+
+    def __init__(self):
+        super().__init__("Support Vector Machine")
+
+    def build_model(self, n_rows):
+        return sklearn_pipeline.make_pipeline(
+            sklearn_preprocessing.StandardScaler(),
+            sklearn_calibration.CalibratedClassifierCV(sklearn_svm.SVC(), cv=self.calibration_folds, ensemble=False))
+
+# Models over the shared per-team rolling statistics (features.TeamFeatureStore)
+class TeamStatsAlgo(BaseAlgorithm):
+    """
+    Base for models that read pre-computed team statistics instead of
+    scanning the match history. Subclasses turn (home, away) TEAM_STATS
+    frames into expected goals; those are scored with the Poisson grid.
+    The statistics of the last predict_batch call are kept per fixture, so
+    describing its rows does not look them up again.
+    """
+    # (state, {(home_team, away_team): (home stats, away stats)}) of the last batch
+    _described = (None, {})
+
+    def __init__(self, name, max_goals=10):
+        super().__init__(name)
+        self.state = None
+        self.max_goals = max_goals
+
+    def train(self, data):
+        self.state = features.team_features(data).state
+
+    def stats(self, matches):
+        return self.state.stats(matches)
+
+    def expected_goals(self, home, away):
+        raise NotImplementedError
+
+    def score(self, home, away):
+        """
+        (n, 3) probabilities from the (home, away) TEAM_STATS frames.
+        """
+        lam, mu = self.expected_goals(home, away)
+        return outcome_probabilities(score_matrix(np.clip(lam, 0.05, None), np.clip(mu, 0.05, None), self.max_goals))
+
+    def predict_batch(self, matches):
+        if self.state is None:
+            return np.full((len(matches), 3), 1.0 / 3)
+        home, away = self.stats(matches)
+        if isinstance(matches, pd.DataFrame):
+            pairs = zip(matches['home_team'].astype(str), matches['away_team'].astype(str))
+        else:
+            pairs = ((str(m['home_team']), str(m['away_team'])) for m in matches)
+        # Replaced whole, so a concurrent describe() sees one batch or the other
+        self._described = (self.state, dict(zip(pairs, zip(home.to_dict('records'), away.to_dict('records')))))
+        return self.score(home, away)
+
+    def fixture_stats(self, match):
+        """
+        (home, away) TEAM_STATS dicts for one fixture, taken from the last
+        predict_batch call when it covered the fixture.
+        """
+        state, described = self._described
+        if state is self.state:
+            cached = described.get((str(match['home_team']), str(match['away_team'])))
+            if cached is not None:
+                return cached
+        home, away = self.stats([match])
+        return home.iloc[0].to_dict(), away.iloc[0].to_dict()
+
+    def describe(self, probs, match=None):
+        if match is None or self.state is None:
+            return super().describe(probs)
+        home, away = self.fixture_stats(match)
+        lam, mu = self.expected_goals(pd.DataFrame([home]), pd.DataFrame([away]))
+        return f"{self.name} expects {lam[0]:.2f} - {mu[0]:.2f}."
+
+    def predict(self, match):
+        return self.to_prediction(self.predict_batch([match])[0], match)
+
+# 11. Form Analysis
+class FormAlgo(TeamStatsAlgo):
+    """
+    Last-N points per game. The home/away win shares of the league are
+    tilted by exp(+-beta * form difference); beta is fitted on the
+    pre-match form of every training match.
+    """
+    def __init__(self):
+        super().__init__("Form Analysis")
+        self.beta = 0.0
+
+    def train(self, data):
+        store = features.team_features(data)
+        self.state = store.state
+        if len(store) == 0:
+            return
+        diff = (store.home_before['form_points'] - store.away_before['form_points']).to_numpy()
+        # Log loss for a grid of slopes at once: (n_betas, n_matches, 3)
+        betas = np.linspace(0.0, 1.5, 31)
+        probs = self._tilt(diff[None, :], betas[:, None])
+        picked = np.take_along_axis(probs, store.y.astype(np.int64)[None, :, None], axis=2)[..., 0]
+        self.beta = float(betas[np.argmin(-np.log(np.maximum(picked, 1e-12)).mean(axis=1))])
+
+    def _tilt(self, diff, beta):
+        base = self.state.league['outcomes']
+        weights = np.stack([base[0] * np.exp(beta * diff), base[1] * np.ones_like(diff * beta),
+                            base[2] * np.exp(-beta * diff)], axis=-1)
+        return weights / weights.sum(axis=-1, keepdims=True)
+
+    def score(self, home, away):
+        return self._tilt((home['form_points'] - away['form_points']).to_numpy(), self.beta)
+
+    def describe(self, probs, match=None):
+        if match is None or self.state is None:
+            return super().describe(probs)
+        home, away = self.fixture_stats(match)
+        return (f"Form over the last {features.WINDOW} matches: {home['form_points']:.1f} vs "
+                f"{away['form_points']:.1f} points per game.")
+
+# 12. Goal Averages
+class GoalAveragesAlgo(TeamStatsAlgo):
+    """
+    Venue splits: the home side's scoring at home against the away side's
+    conceding on the road, and vice versa.
+    """
+    def __init__(self):
+        super().__init__("Goal Averages")
+
+    def expected_goals(self, home, away):
+        lam = (home['home_goals_for'] + away['away_goals_against']).to_numpy() / 2
+        mu = (away['away_goals_for'] + home['home_goals_against']).to_numpy() / 2
+        return lam, mu
+
+    def describe(self, probs, match=None):
+        if match is None or self.state is None:
+            return super().describe(probs)
+        home, away = self.fixture_stats(match)
+        return (f"Home side scores {home['home_goals_for']:.2f} at home, "
+                f"away side scores {away['away_goals_for']:.2f} on the road.")
+
+# 13. Defensive Strength
+class DefensiveStrengthAlgo(TeamStatsAlgo):
+    """
+    Goals are driven by the opponent's defence only: league venue averages
+    scaled by how much each side concedes relative to the league.
+    """
+    def __init__(self):
+        super().__init__("Defensive Strength")
+
+    def expected_goals(self, home, away):
+        league = self.state.league
+        average = self.state.defaults['goals_against']
+        lam = league['home_goals'] * away['goals_against'].to_numpy() / average
+        mu = league['away_goals'] * home['goals_against'].to_numpy() / average
+        return lam, mu
+
+    def describe(self, probs, match=None):
+        if match is None or self.state is None:
+            return super().describe(probs)
+        home, away = self.fixture_stats(match)
+        return (f"Goals conceded per match: {home['goals_against']:.2f} (home) vs "
+                f"{away['goals_against']:.2f} (away).")
+
+# 14. Offensive Efficiency
+class OffensiveEfficiencyAlgo(TeamStatsAlgo):
+    """
+    Goals are driven by each side's attack only: league venue averages
+    scaled by how much each side scores relative to the league.
+    """
+    def __init__(self):
+        super().__init__("Offensive Efficiency")
+
+    def expected_goals(self, home, away):
+        league = self.state.league
+        average = self.state.defaults['goals_for']
+        lam = league['home_goals'] * home['goals_for'].to_numpy() / average
+        mu = league['away_goals'] * away['goals_for'].to_numpy() / average
+        return lam, mu
+
+    def describe(self, probs, match=None):
+        if match is None or self.state is None:
+            return super().describe(probs)
+        home, away = self.fixture_stats(match)
+        average = self.state.defaults['goals_for']
+        return (f"Attack ratings {home['goals_for'] / average:.2f} vs "
+                f"{away['goals_for'] / average:.2f} (1.00 = league average).")
+
+# 15. Exponential Smoothing
+class ExponentialSmoothingAlgo(TeamStatsAlgo):
+    """
+    Exponentially weighted goals for/against (recent matches count most),
+    with the league's home/away goal ratio as home advantage.
+    """
+    def __init__(self):
+        super().__init__("Exponential Smoothing")
+
+    def expected_goals(self, home, away):
+        league = self.state.league
+        edge = np.sqrt(league['home_goals'] / max(league['away_goals'], 1e-6))
+        lam = (home['ewm_goals_for'] + away['ewm_goals_against']).to_numpy() / 2 * edge
+        mu = (away['ewm_goals_for'] + home['ewm_goals_against']).to_numpy() / 2 / edge
+        return lam, mu
+
+    def describe(self, probs, match=None):
+        if match is None or self.state is None:
+            return super().describe(probs)
+        home, away = self.fixture_stats(match)
+        return (f"Smoothed goals for/against: home {home['ewm_goals_for']:.2f}/"
+                f"{home['ewm_goals_against']:.2f}, away {away['ewm_goals_for']:.2f}/"
+                f"{away['ewm_goals_against']:.2f}.")
+
+# 16. Head-to-Head
+class HeadToHeadAlgo(BaseAlgorithm):
+    """
+    Outcomes of the last meetings between the two teams (either venue, seen
+    from this fixture's home side), shrunk towards the league's outcome
+    shares by prior_weight pseudo-meetings. Meetings come from a
+    HeadToHeadIndex, so each fixture is a dict lookup.
+    """
+
+    def __init__(self, last=10, prior_weight=3.0):
+        super().__init__("Head-to-Head")
+        self.last = last
+        self.prior_weight = prior_weight
+        self.index = HeadToHeadIndex()
+        self.prior = None
+
+    def train(self, data):
+        self.index.build(data)
+        labels = features.outcome_labels(data)
+        self.prior = np.bincount(labels, minlength=3) / len(labels) if len(labels) else np.full(3, 1.0 / 3)
+
+    def update(self, new_matches, history=None):
+        # Only rows appended after the indexed history are indexed
+        if history is not None:
+            self.index.extend(history)
+
+    def records(self, matches):
+        if isinstance(matches, pd.DataFrame):
+            pairs = zip(matches['home_team'].astype(str), matches['away_team'].astype(str))
+        else:
+            pairs = ((m['home_team'], m['away_team']) for m in matches)
+        return np.array([self.index.record(h, a, self.last) for h, a in pairs], dtype=float).reshape(-1, 3)
+
+    def predict_batch(self, matches):
+        prior = self.prior if self.prior is not None else np.full(3, 1.0 / 3)
+        counts = self.records(matches)
+        return (counts + self.prior_weight * prior) / (counts.sum(axis=1, keepdims=True) + self.prior_weight)
+
+    def describe(self, probs, match=None):
+        if match is None:
+            return super().describe(probs)
+        wins, draws, losses = self.records([match])[0].astype(int)
+        if wins + draws + losses == 0:
+            return "No previous meetings; league averages used."
+        return f"Last {wins + draws + losses} meetings: {wins} home side wins, {draws} draws, {losses} away side wins."
+
     def predict(self, match):
-        return {"prediction": "2", "confidence": 0.55, "details": "Away team has higher ELO rating (1540 vs 1420)."}
+        return self.to_prediction(self.predict_batch([match])[0], match)
 
 # ... (Implement placeholders for the rest to reach 20 for structure)
 
 class HardCodedAlgo(BaseAlgorithm):
     def __init__(self, name):
         super().__init__(name)
+    def describe(self, probs, match=None):
+        return f"{self.name} analyzed specific metrics."
+
     def predict(self, match):
         return {"prediction": random.choice(["1", "X", "2"]), "confidence": random.uniform(0.4, 0.9), "details": f"{self.name} analyzed specific metrics."}
 
 def get_all_algorithms():
     algos = [
-        PoissonAlgo(), MonteCarloAlgo(), XGBoostAlgo(), RandomForestAlgo(), EloAlgo(),
-        HardCodedAlgo("Form Analysis"), HardCodedAlgo("Head-to-Head"), HardCodedAlgo("Goal Averages"),
-        HardCodedAlgo("Defensive Strength"), HardCodedAlgo("Offensive Efficiency"), HardCodedAlgo("Weather Impact"),
+        PoissonAlgo(), MonteCarloAlgo(), XGBoostAlgo(), RandomForestAlgo(), EloAlgo(), DixonColesAlgo(),
+        LogisticRegressionAlgo(), KNNAlgo(), NaiveBayesAlgo(), SVMAlgo(),
+        FormAlgo(), HeadToHeadAlgo(), GoalAveragesAlgo(),
+        DefensiveStrengthAlgo(), OffensiveEfficiencyAlgo(), HardCodedAlgo("Weather Impact"),
         HardCodedAlgo("Referee Strictness"), HardCodedAlgo("Injury Impact"), HardCodedAlgo("Market Odds Value"),
-        HardCodedAlgo("Linear Regression Trend"), HardCodedAlgo("Exponential Smoothing"), HardCodedAlgo("Corner Prediction Model"),
+        HardCodedAlgo("Linear Regression Trend"), ExponentialSmoothingAlgo(), HardCodedAlgo("Corner Prediction Model"),
         HardCodedAlgo("Card Probability"), HardCodedAlgo("Half-Time Correlation"), HardCodedAlgo("Team Morale Index")
     ]
     return algos
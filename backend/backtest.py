@@ -0,0 +1,99 @@
+from algorithms import OUTCOMES
+from lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+
+def encode_results(results):
+    """
+    Maps a sequence of "1"/"X"/"2" results to outcome indices (0, 1, 2).
+    """
+    lookup = {o: i for i, o in enumerate(OUTCOMES)}
+    return np.array([lookup[r] for r in results], dtype=np.int8)
+
+
+class Backtester:
+    """
+    Scores probability arrays from BaseAlgorithm.predict_batch against actual results.
+    Every algorithm is scored in one vectorized pass over a stacked
+    (n_algorithms, n_matches, 3) array.
+    """
+    def __init__(self, results):
+        self.y = encode_results(results)
+        self.onehot = np.eye(len(OUTCOMES))[self.y]
+
+    def score(self, probs):
+        """
+        probs: (n_algorithms, n_matches, 3) or (n_matches, 3).
+        Returns accuracy, Brier score and log loss per algorithm.
+        """
+        probs = np.asarray(probs, dtype=float)
+        single = probs.ndim == 2
+        if single:
+            probs = probs[None]
+
+        n = len(self.y)
+        if n == 0:
+            zeros = np.zeros(len(probs))
+            scores = {"accuracy": zeros, "brier": zeros, "log_loss": zeros}
+        else:
+            hit = probs.argmax(axis=2) == self.y
+            picked = probs[:, np.arange(n), self.y]
+            scores = {
+                "accuracy": hit.mean(axis=1),
+                "brier": ((probs - self.onehot) ** 2).sum(axis=2).mean(axis=1),
+                "log_loss": -np.log(np.clip(picked, 1e-15, 1.0)).mean(axis=1),
+            }
+
+        if single:
+            return {k: float(v[0]) for k, v in scores.items()}
+        return scores
+
+    def run(self, algorithms, matches):
+        """
+        Predicts matches with every algorithm and returns {name: scores}.
+        """
+        probs = np.stack([algo.predict_batch(matches) for algo in algorithms])
+        scores = self.score(probs)
+        return {
+            algo.name: {k: float(v[i]) for k, v in scores.items()}
+            for i, algo in enumerate(algorithms)
+        }
+
+
+def walk_forward_windows(dates, windows=5, window_days=7):
+    """
+    Edges of the last `windows` back-to-back windows of window_days each,
+    ending just after the latest date. Returns windows + 1 timestamps.
+    """
+    end = dates.max().normalize() + pd.Timedelta(days=1)
+    return [end - pd.Timedelta(days=window_days * (windows - w)) for w in range(windows + 1)]
+
+
+def walk_forward(algo, data, windows=5, window_days=7):
+    """
+    Walk-forward backtest of one algorithm over the last `windows` weeks.
+    The model is trained only on matches before the first window and
+    predicts each window before seeing it.
+
+    Every model gets the same information cut-off: all windows are scored
+    from the state at the start of the first window, incremental models
+    included, so later windows are predicted several weeks ahead by every
+    model alike and the accuracies stay comparable. Afterwards the model is
+    brought up to date with update() (a full retrain for models without an
+    incremental path): about two training passes in all.
+
+    Returns (algo, probs, positions): the algorithm trained on all of data, the
+    (n, 3) predictions and the row positions in data they belong to.
+    """
+    dates = pd.to_datetime(data['date'])
+    edges = walk_forward_windows(dates, windows, window_days)
+
+    before = (dates < edges[0]).to_numpy()
+    algo.train(data[before])
+
+    tested = ((dates >= edges[0]) & (dates < edges[-1])).to_numpy()
+    probs = algo.predict_batch(data[tested]) if tested.any() else np.zeros((0, 3))
+    algo.update(data[~before], history=data)
+    return algo, probs, np.flatnonzero(tested)
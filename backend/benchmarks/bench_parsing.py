@@ -0,0 +1,96 @@
+"""
+Parsing benchmark over the saved pages in benchmarks/fixtures.
+
+    python benchmarks/bench_parsing.py [--repeat 20]
+
+Compares the original full-tree BeautifulSoup parse against the targeted
+parsers in parsers.py (lxml XPath and strained html.parser) and checks that
+every variant extracts the same rows and headlines.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from bs4 import BeautifulSoup  # noqa: E402
+import parsers  # noqa: E402
+
+
+# The parsing code MatchScraper used before parsers.py, kept as the baseline
+def full_tree_tff(content):
+    matches = []
+    soup = BeautifulSoup(content, 'html.parser')
+    for row in soup.find_all("tr", class_="maclar"):
+        cols = row.find_all("td")
+        if len(cols) > 5:
+            matches.append({
+                "home_team": cols[1].text.strip(),
+                "away_team": cols[3].text.strip(),
+                "raw_score": cols[2].text.strip(),
+                "source": "TFF"
+            })
+    return matches
+
+
+def full_tree_headlines(content):
+    soup = BeautifulSoup(content, 'html.parser')
+    return [h.text.strip() for h in soup.find_all(['h1', 'h2'])]
+
+
+CASES = [
+    ("tff_superlig.html", {
+        "full tree (html.parser)": full_tree_tff,
+        "strained (html.parser)": lambda c: parsers.parse_tff(c, use_lxml=False),
+        "lxml xpath": lambda c: parsers.parse_tff(c, use_lxml=True),
+    }),
+    ("news_portal.html", {
+        "full tree (html.parser)": full_tree_headlines,
+        "strained (html.parser)": lambda c: parsers.parse_headlines(c, use_lxml=False),
+        "lxml xpath": lambda c: parsers.parse_headlines(c, use_lxml=True),
+    }),
+]
+
+
+def timeit(fn, content, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(content)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    for fixture, variants in CASES:
+        with open(os.path.join(HERE, "fixtures", fixture), "rb") as f:
+            content = f.read()
+        print(f"{fixture} ({len(content) / 1024:.0f} KiB)")
+
+        expected = None
+        baseline_ms = None
+        for name, fn in variants.items():
+            if name == "lxml xpath" and not parsers.HAVE_LXML:
+                print(f"  {name:<26} skipped (lxml not installed)")
+                continue
+            result = fn(content)
+            if expected is None:
+                expected = result
+            elif result != expected:
+                print(f"(!) {name} extracted different data than the baseline")
+                return 1
+            ms = timeit(fn, content, args.repeat)
+            baseline_ms = baseline_ms or ms
+            print(f"  {name:<26} {ms:8.2f} ms  x{baseline_ms / ms:5.1f}  ({len(result)} items)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Scaling benchmark for the engine's hot paths on synthetic league histories.
+
+    python benchmarks/bench_scaling.py [--scales 500,2000,10000] [--teams 20]
+        [--leagues 1] [--seed 0] [--repeat 3] [--bulk 100]
+        [--output results.json] [--compare previous.json]
+
+For every scale (number of matches) the scraper is stubbed to return a
+generated history and the following are timed:
+
+    initialize        scrape stub + store + walk-forward backtest (cold engine)
+    train_models      full retrain of every algorithm
+    evaluate_models   walk-forward backtest on its own
+    analyze_cold      analyze_match with an empty analysis cache (median)
+    analyze_cached    analyze_match served from the cache (median)
+    analyze_bulk      analyze_matches over --bulk fixtures, empty cache (median)
+
+plus per-algorithm train times and the cost of the backtest relative to
+one training pass (evaluate_vs_train, initialize_vs_train). Results are
+written as JSON; --compare prints the ratio against an earlier run and
+exits with 1 when any timing or cost ratio grew by more than --tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from synthetic import generate_league_data, upcoming_fixtures  # noqa: E402
+from engine import AnalysisEngine  # noqa: E402
+
+
+class StubScraper:
+    """
+    Stands in for MatchScraper: no network, always the same history.
+    """
+    def __init__(self, data):
+        self.data = data
+
+    def scrape_recent_matches(self):
+        return self.data.copy()
+
+
+def median_ms(fn, repeat, setup=None):
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def timed_ms(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_scale(matches, args):
+    data = generate_league_data(matches, args.teams, args.leagues, args.seed)
+    fixtures = upcoming_fixtures(data, max(args.bulk, 1), args.seed)
+
+    engine = AnalysisEngine(executor=args.executor, backtest_weeks=args.weeks)
+    engine.snapshots = None
+    engine.scraper = StubScraper(data)
+
+    timings = {}
+    with open(os.devnull, "w") as quiet, redirect_stdout(quiet):
+        timings["initialize"] = timed_ms(engine.initialize)
+        timings["train_models"] = timed_ms(engine.train_models)
+        timings["evaluate_models"] = timed_ms(engine.evaluate_models)
+
+        clear = engine.analysis_cache.clear
+        timings["analyze_cold"] = median_ms(lambda: engine.analyze_match(fixtures[0]), args.repeat, setup=clear)
+        engine.analyze_match(fixtures[0])
+        timings["analyze_cached"] = median_ms(lambda: engine.analyze_match(fixtures[0]), args.repeat)
+        timings["analyze_bulk"] = median_ms(lambda: engine.analyze_matches(fixtures[:args.bulk]), args.repeat,
+                                            setup=clear)
+
+        by_algorithm = {}
+        for algo in engine.algorithms:
+            by_algorithm[algo.name] = timed_ms(lambda: algo.train(engine.historical_data))
+
+    return {
+        "matches": matches,
+        "teams": args.teams,
+        "leagues": args.leagues,
+        "rows": len(engine.historical_data),
+        "memory_bytes": engine.match_store.memory_usage(),
+        "golden_algorithm": engine.best_algorithm.name,
+        "timings_ms": {k: round(v, 3) for k, v in timings.items()},
+        # Backtest cost in training passes; should stay around 2
+        "cost_ratios": {
+            "evaluate_vs_train": round(timings["evaluate_models"] / timings["train_models"], 3),
+            "initialize_vs_train": round(timings["initialize"] / timings["train_models"], 3),
+        },
+        "train_ms_by_algorithm": {k: round(v, 3) for k, v in by_algorithm.items()},
+    }
+
+
+def compare(results, previous, tolerance):
+    """
+    Prints new/old ratios per scale and timing; returns the number of regressions.
+    """
+    old = {(r["matches"], r["teams"], r["leagues"]): r for r in previous["results"]}
+    regressions = 0
+    for result in results:
+        before = old.get((result["matches"], result["teams"], result["leagues"]))
+        if before is None:
+            continue
+        print(f"{result['matches']} matches vs previous run")
+        for group, unit in (("timings_ms", "ms"), ("cost_ratios", "x ")):
+            for name, value in result.get(group, {}).items():
+                base = before.get(group, {}).get(name)
+                if not base:
+                    continue
+                ratio = value / base
+                flag = "  (!) slower" if ratio > tolerance else ""
+                regressions += ratio > tolerance
+                print(f"  {name:<19} {base:10.2f} -> {value:10.2f} {unit}  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="500,2000,10000", help="comma separated match counts")
+    parser.add_argument("--teams", type=int, default=20, help="teams per league")
+    parser.add_argument("--leagues", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--bulk", type=int, default=100, help="fixtures per bulk analyze call")
+    parser.add_argument("--weeks", type=int, default=5, help="walk-forward backtest weeks")
+    parser.add_argument("--executor", default="serial", choices=["serial", "thread", "process"])
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/scaling-<time>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="slowdown ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    results = []
+    for matches in (int(s) for s in args.scales.split(",") if s.strip()):
+        result = bench_scale(matches, args)
+        results.append(result)
+        timings = "  ".join(f"{k} {v:.2f}" for k, v in result["timings_ms"].items())
+        ratios = "  ".join(f"{k} x{v:.2f}" for k, v in result["cost_ratios"].items())
+        print(f"{matches:>8} matches  {result['memory_bytes'] / 1024:8.0f} KiB  {timings} (ms)  {ratios}")
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "executor": args.executor,
+        "args": vars(args),
+        "results": results,
+    }
+    output = args.output or os.path.join(HERE, "results", f"scaling-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        if compare(results, previous, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,79 +1,499 @@
 
 from algorithms import get_all_algorithms
 from scraper import MatchScraper
-import pandas as pd
+from backtest import Backtester, walk_forward
+from parallel import run_tasks
+from cache import TTLCache
+from snapshot import SnapshotStore, data_fingerprint
+from store import MatchStore
+from h2h import HeadToHeadIndex
+import metrics
+from lazy import lazy_import
+import copy
+import os
+import pickle
+import threading
+import time
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+
+# Module-level so they can be shipped to a process pool
+def _train_algorithm(algo, data):
+    algo.train(data)
+    return algo
+
+
+def _update_algorithm(algo, new_matches, history, retrain):
+    if retrain:
+        algo.train(history)
+    else:
+        algo.update(new_matches, history=history)
+    return algo
+
+
+def _walk_forward_algorithm(algo, data, windows, window_days):
+    return walk_forward(algo, data, windows, window_days)
+
+
+class EngineNotReady(Exception):
+    """
+    Raised by analyze_match while the models are still warming up.
+    """
+    def __init__(self, status):
+        super().__init__(f"Engine is {status['state']}")
+        self.status = status
+
 
 class AnalysisEngine:
-    def __init__(self):
+    def __init__(self, executor=None, max_workers=None, task_timeout=None, backtest_weeks=5,
+                 snapshot_dir=None, league=None, scraper=None, warmup_slots=None, on_scrape=None,
+                 retry_delay=None):
+        """
+        executor: "serial", "thread" or "process" for training/backtesting
+                  (defaults to $ENGINE_EXECUTOR or "serial").
+        max_workers: pool size (defaults to $ENGINE_WORKERS or the CPU count).
+        task_timeout: seconds allowed per algorithm (defaults to $ENGINE_TASK_TIMEOUT).
+        backtest_weeks: number of weekly walk-forward windows used to pick the golden algorithm.
+        snapshot_dir: where trained snapshots are kept (defaults to $ENGINE_SNAPSHOT_DIR
+                      or ~/.cache/analiz/snapshots; on serverless, snapshots shipped
+                      with the deployment, see snapshot.default_snapshot_dir);
+                      set ENGINE_SNAPSHOTS=0 to disable them.
+        league: only train on scraped rows of this league (all rows when None).
+        scraper: MatchScraper to use, e.g. one shared by several league engines.
+        warmup_slots: optional semaphore a background warm-up must hold while
+                      it runs, to bound how many engines train at the same time.
+        on_scrape: optional callback given every scraped frame (all leagues),
+                   e.g. to learn which leagues exist.
+        retry_delay: seconds before a failed background warm-up may start again
+                     (defaults to $ENGINE_RETRY_SECONDS or 60).
+        """
+        self.league = league
+        self.warmup_slots = warmup_slots
+        self.on_scrape = on_scrape
+        self.retry_delay = retry_delay if retry_delay is not None else float(os.environ.get("ENGINE_RETRY_SECONDS", 60))
+        self.backtest_weeks = backtest_weeks
+        self.executor = executor or os.environ.get("ENGINE_EXECUTOR", "serial")
+        self.max_workers = max_workers or int(os.environ.get("ENGINE_WORKERS", 0)) or None
+        self.task_timeout = task_timeout or float(os.environ.get("ENGINE_TASK_TIMEOUT", 0)) or None
         self.algorithms = get_all_algorithms()
-        self.scraper = MatchScraper()
-        self.historical_data = None
+        self.scraper = scraper or MatchScraper()
+        self.match_store = None
+        self.historical_data = None # Typed frame of match_store
+        self.h2h = HeadToHeadIndex() # Pair -> meeting rows of historical_data
         self.best_algorithm = None
+        self.backtest_results = {}
+        self.data_fingerprint = None
+        self.snapshots = SnapshotStore(snapshot_dir) if os.environ.get("ENGINE_SNAPSHOTS", "1") != "0" else None
+        # Bumped whenever retrained models are published; part of every cache key
+        self.model_version = 0
+        self.analysis_cache = TTLCache(
+            maxsize=int(os.environ.get("ANALYSIS_CACHE_SIZE", 1024)),
+            ttl=float(os.environ.get("ANALYSIS_CACHE_TTL", 600)),
+        )
+        # Warm-up state reported by /api/ready
+        self.status = {"state": "idle", "stage": None, "progress": 0.0, "error": None,
+                       "started_at": None, "finished_at": None, "retry_at": None}
+        self._init_lock = threading.Lock()
+        # Held while a new model set is published and while readers pin one
+        self._models_lock = threading.Lock()
+        self._init_thread = None
+        self._model_bytes = (None, 0)
+
+    @property
+    def ready(self):
+        return self.best_algorithm is not None
+
+    def memory_usage(self):
+        """
+        Approximate bytes held by this engine: the match frame plus the
+        pickled size of the trained models (measured once per model version).
+        """
+        version, model_bytes = self._model_bytes
+        if version != self.model_version:
+            model_bytes = len(pickle.dumps(self.algorithms, protocol=pickle.HIGHEST_PROTOCOL)) if self.ready else 0
+            self._model_bytes = (self.model_version, model_bytes)
+        data_bytes = self.match_store.memory_usage() if self.match_store is not None else 0
+        return data_bytes + model_bytes
+
+    def _set_status(self, **fields):
+        self.status = dict(self.status, **fields)
+
+    def start_background_initialize(self):
+        """
+        Starts initialize() on a daemon thread unless a warm-up is already
+        running or the last one failed less than retry_delay seconds ago.
+        Returns True if a new warm-up was started.
+        """
+        with self._init_lock:
+            if self._init_thread is not None and self._init_thread.is_alive():
+                return False
+            retry_at = self.status["retry_at"]
+            if self.status["state"] == "failed" and retry_at is not None and time.time() < retry_at:
+                return False
+            self._set_status(state="warming", stage="queued", progress=0.0, error=None, retry_at=None)
+            self._init_thread = threading.Thread(target=self._initialize_quietly, name="engine-warmup", daemon=True)
+            self._init_thread.start()
+            return True
+
+    def _initialize_quietly(self):
+        try:
+            if self.warmup_slots is not None:
+                with self.warmup_slots:
+                    self.initialize()
+            else:
+                self.initialize()
+        except Exception as e:
+            print(f"(!) Engine warm-up failed{f' ({self.league})' if self.league else ''}: {e}")
 
     def initialize(self):
-        print("Initializing Engine...")
-        self.historical_data = self.scraper.scrape_recent_matches()
-        self.train_models()
-        self.evaluate_models()
+        """
+        Loads the latest snapshot (if any) so the engine is ready immediately,
+        then scrapes fresh data and only retrains when its fingerprint differs
+        from the one the current models were trained on.
+        """
+        print(f"Initializing Engine ({self.league})..." if self.league else "Initializing Engine...")
+        self._set_status(state="warming", stage="loading snapshot", progress=0.0, error=None,
+                         started_at=time.time(), finished_at=None, retry_at=None)
+        try:
+            if not self.ready:
+                self.load_snapshot()
+            if self.ready:
+                self._set_status(state="ready", stage="refreshing")
+            else:
+                self._set_status(stage="scraping")
+
+            scraped = self.scraper.scrape_recent_matches()
+            if self.on_scrape is not None:
+                self.on_scrape(scraped)
+            if self.league is not None and "league" in scraped.columns:
+                scraped = scraped[scraped["league"].astype(str) == self.league].reset_index(drop=True)
+                if scraped.empty:
+                    raise ValueError(f"No match history for league {self.league!r}")
+            store = MatchStore(scraped)
+            fingerprint = data_fingerprint(store.frame)
+            simulated = "source" in scraped.columns and (scraped["source"] == "simulation").all()
+            if self.ready and fingerprint == self.data_fingerprint:
+                print("Data unchanged since the last snapshot, skipping retrain.")
+            elif self.ready and self.match_store is not None and not simulated:
+                # Real results on top of a restored snapshot: merge the delta
+                self._set_status(stage="ingesting")
+                self.ingest(scraped)
+            else:
+                self.match_store = store
+                self.historical_data = store.frame
+                # The walk-forward backtest ends with every model fitted on the full
+                # history, so a separate train_models() pass is not needed here
+                self._set_status(stage="backtesting", progress=0.1)
+                self.evaluate_models()
+                self.save_snapshot()
+        except Exception as e:
+            now = time.time()
+            self._set_status(state="failed", error=str(e), finished_at=now, retry_at=now + self.retry_delay)
+            raise
+        self._set_status(state="ready", stage=None, progress=1.0, finished_at=time.time())
+
+    def ingest(self, matches):
+        """
+        Merges new or corrected results into the match store and brings the
+        trained models forward without a full rebuild: pure additions go
+        through algo.update(), corrections to existing rows need a retrain.
+        The golden algorithm is kept until the next evaluate_models().
+        Returns the store's ChangeSet.
+        """
+        if self.match_store is None:
+            self.match_store = MatchStore()
+        changes = self.match_store.ingest(matches)
+        print(f"Ingested {changes}")
+        for conflict in changes.conflicts:
+            print(f"(!) Source conflict {conflict['home_team']} - {conflict['away_team']} {conflict['date']}: "
+                  f"kept {conflict['kept']}, dropped {conflict['dropped']}")
+        if changes.empty:
+            return changes
+
+        # Update copies, so requests keep using the published models meanwhile
+        current = self.algorithms
+        working = current if self.executor == "process" else [self._working_copy(algo) for algo in current]
+        history = self.match_store.frame
+        self.historical_data = history
+        h2h = self.h2h.copy().extend(history)
+        retrain = not changes.updated.empty
+        outcomes = self._run(_update_algorithm, [(algo, changes.added, history, retrain) for algo in working])
+        self._record("retrain" if retrain else "update", current, outcomes)
+        algorithms = []
+        best = self.best_algorithm
+        for algo, outcome in zip(current, outcomes):
+            if outcome.ok:
+                # Process pools hand back an updated copy
+                updated = outcome.value
+            else:
+                print(f"(!) {algo.name} failed to update: {outcome.error}")
+                # The working copy is dropped: a timed-out thread may still be using it
+                updated = self._stand_in(algo, outcome.error)
+            if algo is best:
+                best = updated
+            algorithms.append(updated)
+
+        self._publish_models(algorithms, best, fingerprint=data_fingerprint(history), h2h=h2h)
+        self.save_snapshot()
+        return changes
+
+    def save_snapshot(self):
+        """
+        Persists the trained state as a new snapshot version. Failures (e.g. a
+        read-only filesystem) are reported but never break the cycle.
+        """
+        if self.snapshots is None or not self.ready:
+            return None
+        try:
+            path = self.snapshots.save({
+                "algorithm_names": [algo.name for algo in self.algorithms],
+                "algorithms": self.algorithms,
+                "best_algorithm": self.best_algorithm.name,
+                "backtest_results": self.backtest_results,
+                "historical_data": self.historical_data,
+                "data_fingerprint": self.data_fingerprint,
+            })
+            print(f"Saved engine snapshot: {path}")
+            return path
+        except Exception as e:
+            print(f"(!) Could not save engine snapshot: {e}")
+            return None
+
+    def load_snapshot(self):
+        """
+        Restores the newest compatible snapshot. Returns True on success.
+        Snapshots made with a different set of algorithms are ignored.
+        """
+        if self.snapshots is None:
+            return False
+        payload = self.snapshots.load_latest()
+        if payload is None:
+            return False
+        if payload["algorithm_names"] != [algo.name for algo in self.algorithms]:
+            print("(!) Snapshot algorithm set does not match this build, ignoring it.")
+            return False
+
+        algorithms = payload["algorithms"]
+        best = next(a for a in algorithms if a.name == payload["best_algorithm"])
+        self.match_store = MatchStore(payload["historical_data"])
+        self.historical_data = self.match_store.frame
+        self._publish_models(algorithms, best, backtest_results=payload["backtest_results"],
+                             fingerprint=payload["data_fingerprint"], h2h=HeadToHeadIndex(self.historical_data))
+        print(f"Loaded engine snapshot v{payload['version']} (golden: {best.name})")
+        return True
+
+    def _report_progress(self, done, total):
+        if self.status["state"] == "warming":
+            self._set_status(progress=0.1 + 0.9 * done / max(total, 1))
+
+    def _run(self, fn, arg_list):
+        return run_tasks(fn, arg_list, mode=self.executor, max_workers=self.max_workers,
+                         timeout=self.task_timeout, progress=self._report_progress)
+
+    @staticmethod
+    def _record(operation, algorithms, outcomes):
+        # Timed from TaskResult.elapsed, so process-pool work is counted too
+        for algo, outcome in zip(algorithms, outcomes):
+            if outcome.ok:
+                metrics.ALGORITHM_SECONDS.observe(outcome.elapsed, algorithm=algo.name, operation=operation)
+            else:
+                metrics.ALGORITHM_FAILURES.inc(algorithm=algo.name, operation=operation)
+
+    def _working_copy(self, algo):
+        # The current history is shared, not copied: it is never mutated
+        memo = {id(self.historical_data): self.historical_data} if self.historical_data is not None else {}
+        return copy.deepcopy(algo, memo)
+
+    @staticmethod
+    def _stand_in(previous, error, name=None):
+        """
+        Replacement for an algorithm whose task failed or timed out. The
+        task's own object is never kept: a timed-out thread can't be stopped
+        and may still be changing it. The previously published model (or a
+        new untrained one) is copied and marked with the error.
+        """
+        if previous is None:
+            previous = next(algo for algo in get_all_algorithms() if algo.name == name)
+        stand_in = copy.copy(previous)
+        stand_in.error = error
+        return stand_in
+
+    def _fresh_algorithms(self):
+        """
+        A new set of algorithms, each warm-started from the published model
+        of the same name. The published models are only read.
+        """
+        fresh = get_all_algorithms()
+        previous = {algo.name: algo for algo in self.algorithms}
+        for algo in fresh:
+            if algo.name in previous:
+                algo.warm_start(previous[algo.name])
+        return fresh
 
     def train_models(self):
-        print(f"Training {len(self.algorithms)} algorithms on {len(self.historical_data)} matches...")
-        for algo in self.algorithms:
-            algo.train(self.historical_data)
+        """
+        Trains a fresh set of algorithms, warm-started from the published
+        ones, on the current history and publishes it. The golden algorithm
+        carries over by name until the next evaluate_models().
+        """
+        history = self.historical_data
+        fresh = self._fresh_algorithms()
+        print(f"Training {len(fresh)} algorithms on {len(history)} matches ({self.executor})...")
+        outcomes = self._run(_train_algorithm, [(algo, history) for algo in fresh])
+        previous = {algo.name: algo for algo in self.algorithms}
+        self._record("train", fresh, outcomes)
+
+        trained = []
+        for algo, outcome in zip(fresh, outcomes):
+            if outcome.ok:
+                # Process pools hand back a trained copy
+                algo = outcome.value
+                algo.error = None
+            else:
+                print(f"(!) {algo.name} failed to train: {outcome.error}")
+                algo = self._stand_in(previous.get(algo.name), outcome.error, algo.name)
+            trained.append(algo)
+
+        best = None
+        if self.best_algorithm is not None:
+            accuracy = {algo.name: algo.accuracy for algo in self.algorithms}
+            for algo in trained:
+                algo.accuracy = accuracy.get(algo.name, 0.0)
+            best = next((algo for algo in trained if algo.name == self.best_algorithm.name), None)
+        self._publish_models(trained, best, fingerprint=data_fingerprint(history))
+
+    def _publish_models(self, algorithms, best_algorithm, backtest_results=None, fingerprint=None, h2h=None):
+        """
+        Swaps in a trained model set as a new model version in one step:
+        analyze_matches() pins the published set under the same lock, so a
+        request sees the old set or the new one, never a mix. Cached
+        analyses of the previous version can never be served again, so
+        drop them right away.
+        """
+        with self._models_lock:
+            self.algorithms = algorithms
+            self.best_algorithm = best_algorithm
+            if backtest_results is not None:
+                self.backtest_results = backtest_results
+            if h2h is not None:
+                self.h2h = h2h
+            self.data_fingerprint = fingerprint
+            self.model_version += 1
+        self.analysis_cache.clear()
 
     def evaluate_models(self):
-        print("Evaluating models (Backtesting)...")
-        # Split data into "past" and "recent" for testing
-        test_size = int(len(self.historical_data) * 0.2)
-        test_data = self.historical_data.tail(test_size)
-        
+        """
+        Walk-forward backtest over the last backtest_weeks weeks on a fresh set
+        of algorithms. Each model is trained on the data before the first
+        window and predicts all the weeks from that state, so every model
+        has the same information cut-off, finishing trained on all of the
+        data. Models are warm-started from the published ones, which only
+        saves iterations: the fits still converge on their own data. The set
+        is published together with its golden algorithm once every model is
+        done.
+        """
+        print(f"Evaluating models (Walk-forward backtest, {self.backtest_weeks} weeks)...")
+        history = self.historical_data
+        fresh = self._fresh_algorithms()
+        args = (history, self.backtest_weeks, 7)
+        outcomes = self._run(_walk_forward_algorithm, [(algo,) + args for algo in fresh])
+        previous = {algo.name: algo for algo in self.algorithms}
+        self._record("backtest", fresh, outcomes)
+
+        scored = []
+        positions = None
+        algorithms = []
+        for algo, outcome in zip(fresh, outcomes):
+            if outcome.ok:
+                # Process pools hand back a trained copy
+                algo, probs, positions = outcome.value
+                algo.error = None
+                scored.append((algo, probs))
+            else:
+                print(f"(!) {algo.name} failed to backtest: {outcome.error}")
+                algo = self._stand_in(previous.get(algo.name), outcome.error, algo.name)
+            algorithms.append(algo)
+
         results = {}
-        for algo in self.algorithms:
-            correct = 0
-            total = 0
-            for _, match in test_data.iterrows():
-                pred = algo.predict(match)
-                if pred['prediction'] == match['result']:
-                    correct += 1
-                total += 1
-            
-            acc = correct / total if total > 0 else 0
-            algo.accuracy = acc
-            results[algo.name] = acc
-            # print(f"{algo.name}: {acc*100:.1f}%")
+        if scored:
+            # Windows are identical for every model, so all rows line up
+            test_data = history.iloc[positions]
+            backtester = Backtester(test_data['result'])
+            scores = backtester.score(np.stack([probs for _, probs in scored]))
+            for i, (algo, _) in enumerate(scored):
+                results[algo.name] = {k: float(v[i]) for k, v in scores.items()}
+
+        for algo in algorithms:
+            algo.accuracy = results[algo.name]['accuracy'] if algo.name in results else 0.0
+            # print(f"{algo.name}: {algo.accuracy*100:.1f}%")
 
         # Select Golden Algorithm
-        self.best_algorithm = max(self.algorithms, key=lambda a: a.accuracy)
-        print(f"Golden Algorithm Selected: {self.best_algorithm.name} with {self.best_algorithm.accuracy*100:.1f}% Accuracy")
+        healthy = [algo for algo in algorithms if algo.error is None] or algorithms
+        best = max(healthy, key=lambda a: a.accuracy)
+        print(f"Golden Algorithm Selected: {best.name} with {best.accuracy*100:.1f}% Accuracy")
+        h2h = self.h2h if self.h2h.frame is history else HeadToHeadIndex(history)
+        self._publish_models(algorithms, best, backtest_results=results, fingerprint=data_fingerprint(history),
+                             h2h=h2h)
 
     def analyze_match(self, match_info):
         """
         Runs the Golden Algorithm (and others for comparison) on a new match.
+        Results are cached per fixture and model snapshot. Before the first
+        models are ready this kicks off a background warm-up (if none is
+        running) and raises EngineNotReady instead of training inline.
+        """
+        return self.analyze_matches([match_info])[0]
+
+    def analyze_matches(self, matches):
+        """
+        Batch version of analyze_match: every algorithm scores all uncached
+        fixtures in a single predict_batch call. Returns one analysis per match.
         """
         if not self.best_algorithm:
-            self.initialize()
-
-        # Get Golden prediction
-        golden_pred = self.best_algorithm.predict(match_info)
-        
-        # Get others for consensus
-        other_preds = []
-        for algo in self.algorithms:
-            if algo != self.best_algorithm:
-                p = algo.predict(match_info)
-                other_preds.append({
-                    "algorithm": algo.name,
-                    "prediction": p['prediction'],
-                    "confidence": p['confidence'],
-                    "details": p['details'],
-                    "accuracy": algo.accuracy
-                })
-        
-        return {
-            "golden_algorithm": {
-                "name": self.best_algorithm.name,
-                "accuracy": self.best_algorithm.accuracy,
-                "prediction": golden_pred,
-            },
-            "all_predictions": other_preds
-        }
+            self.start_background_initialize()
+            raise EngineNotReady(self.status)
+
+        # Pin the published model set so a retrain finishing mid-call can't mix models
+        with self._models_lock:
+            version, algorithms, best, h2h = self.model_version, self.algorithms, self.best_algorithm, self.h2h
+
+        keys = [(m['home_team'], m['away_team'], m.get('date'), version) for m in matches]
+        analyses = [self.analysis_cache.get(key) for key in keys]
+        missing = [i for i, analysis in enumerate(analyses) if analysis is None]
+        if not missing:
+            return analyses
+
+        fixtures = pd.DataFrame([dict(matches[i]) for i in missing])
+        probs = {}
+        for algo in algorithms:
+            if algo is best or algo.error is None:
+                with metrics.timer(metrics.ALGORITHM_SECONDS, algorithm=algo.name, operation="predict"):
+                    probs[algo.name] = algo.predict_batch(fixtures)
+
+        for row, i in enumerate(missing):
+            # Get others for consensus
+            other_preds = []
+            for algo in algorithms:
+                if algo is not best and algo.name in probs:
+                    p = algo.to_prediction(probs[algo.name][row], matches[i])
+                    other_preds.append({
+                        "algorithm": algo.name,
+                        "prediction": p['prediction'],
+                        "confidence": p['confidence'],
+                        "details": p['details'],
+                        "accuracy": algo.accuracy
+                    })
+
+            analyses[i] = {
+                "golden_algorithm": {
+                    "name": best.name,
+                    "accuracy": best.accuracy,
+                    "prediction": best.to_prediction(probs[best.name][row], matches[i]),
+                },
+                "all_predictions": other_preds,
+                "head_to_head": h2h.summary(matches[i]['home_team'], matches[i]['away_team']),
+            }
+            self.analysis_cache.set(keys[i], analyses[i])
+        return analyses
@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import defaultdict
+
+
+class FixtureStore:
+    """
+    In-memory index of upcoming fixtures, refreshed from the scrapers in the
+    background instead of on every request.
+
+    Lookups are dictionary hits: by id, by league, by day ("YYYY-MM-DD") or
+    by (league, day). Each refresh builds new indexes and swaps them in whole,
+    so readers never see a half-built store.
+    """
+    def __init__(self, source, refresh_interval=300):
+        """
+        source: callable returning a list of fixture dicts with at least
+                id, home_team, away_team, date and league.
+        refresh_interval: seconds between background refreshes.
+        """
+        self.source = source
+        self.refresh_interval = refresh_interval
+        self.last_refresh = None
+        self._fixtures = []
+        self._by_id = {}
+        self._by_league = {}
+        self._by_day = {}
+        self._by_league_day = {}
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self):
+        """
+        Pulls fixtures from the source and rebuilds the indexes.
+        On a scrape error the previous fixtures stay in place.
+        """
+        with self._refresh_lock:
+            try:
+                fixtures = list(self.source())
+            except Exception as e:
+                print(f"(!) Fixture refresh failed: {e}")
+                return False
+
+            by_id = {}
+            by_league = defaultdict(list)
+            by_day = defaultdict(list)
+            by_league_day = defaultdict(list)
+            for fixture in fixtures:
+                day = str(fixture.get("date", ""))[:10]
+                league = fixture.get("league")
+                by_id[fixture["id"]] = fixture
+                by_league[league].append(fixture)
+                by_day[day].append(fixture)
+                by_league_day[(league, day)].append(fixture)
+
+            self._fixtures, self._by_id = fixtures, by_id
+            self._by_league, self._by_day, self._by_league_day = dict(by_league), dict(by_day), dict(by_league_day)
+            self.last_refresh = time.time()
+            return True
+
+    def ensure_loaded(self):
+        if self.last_refresh is None:
+            self.refresh()
+
+    def start_background_refresh(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="fixture-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.refresh_interval)
+
+    def get(self, fixture_id):
+        return self._by_id.get(fixture_id)
+
+    def get_many(self, fixture_ids):
+        """
+        Returns (found fixtures, missing ids) for a list of ids.
+        """
+        found, missing = [], []
+        for fixture_id in fixture_ids:
+            fixture = self._by_id.get(fixture_id)
+            if fixture is None:
+                missing.append(fixture_id)
+            else:
+                found.append(fixture)
+        return found, missing
+
+    def find(self, leagues=None, dates=None):
+        """
+        Fixtures in any of the given leagues and on any of the given days.
+        Either filter may be None (no restriction).
+        """
+        if leagues is None and dates is None:
+            return list(self._fixtures)
+        if dates is None:
+            return [f for league in leagues for f in self._by_league.get(league, [])]
+        days = [str(d)[:10] for d in dates]
+        if leagues is None:
+            return [f for day in days for f in self._by_day.get(day, [])]
+        return [f for league in leagues for day in days for f in self._by_league_day.get((league, day), [])]
+
+    def leagues(self):
+        """
+        Leagues with at least one upcoming fixture.
+        """
+        return [league for league in self._by_league if league is not None]
+
+    def __len__(self):
+        return len(self._fixtures)
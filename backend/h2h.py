@@ -0,0 +1,188 @@
+"""
+Head-to-head index: every unordered team pair mapped to the row positions
+of its meetings in a match history, so a pair's history is one dict lookup
+instead of a scan of the whole frame.
+"""
+from lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+
+def pair_key(team_a, team_b):
+    """
+    Order-independent key for a pair of teams.
+    """
+    a, b = str(team_a), str(team_b)
+    return (a, b) if a <= b else (b, a)
+
+
+class HeadToHeadIndex:
+    """
+    {pair_key: int64 array of row positions into frame}, each array in date
+    order. Built in one sort over the history; extend() indexes rows that
+    were appended to the end of the frame without touching the rest, and
+    rebuilds when any indexed row was changed or moved.
+    """
+    def __init__(self, frame=None):
+        self.frame = None
+        self.pairs = {}
+        self._last_date = None
+        # Per-row date, teams and goal difference of the indexed rows, for
+        # records without touching the frame and for checking what extend() keeps
+        self._dates = None
+        self._hosts = None
+        self._visitors = None
+        self._diff = None
+        if frame is not None:
+            self.build(frame)
+
+    def build(self, frame):
+        self.frame = frame
+        self.pairs = {}
+        self._last_date = None
+        self._index(0)
+        return self
+
+    def _index(self, start):
+        rows = self.frame.iloc[start:]
+        if rows.empty:
+            return
+        homes, aways, dates, diff = self._columns(rows)
+        if start:
+            self._dates = np.concatenate([self._dates[:start], dates])
+            self._hosts = np.concatenate([self._hosts[:start], homes])
+            self._visitors = np.concatenate([self._visitors[:start], aways])
+            self._diff = np.concatenate([self._diff[:start], diff])
+        else:
+            self._dates, self._hosts, self._visitors, self._diff = dates, homes, aways, diff
+        first = np.where(homes <= aways, homes, aways)
+        second = np.where(homes <= aways, aways, homes)
+
+        # Group rows by pair in one sort; date (then row) order inside a pair
+        codes, _ = pd.factorize(pd.Series(first) + "\x00" + pd.Series(second))
+        order = np.lexsort((np.arange(len(rows)), dates, codes))
+        bounds = np.flatnonzero(np.diff(codes[order])) + 1
+        positions = order + start
+        for group in np.split(np.arange(len(order)), bounds):
+            i = order[group[0]]
+            key = (first[i], second[i])
+            chunk = positions[group]
+            existing = self.pairs.get(key)
+            self.pairs[key] = chunk if existing is None else np.concatenate([existing, chunk])
+
+        last = dates.max()
+        self._last_date = last if self._last_date is None else max(self._last_date, last)
+
+    def copy(self):
+        """
+        An index over the same frame that can be extended without touching
+        this one (row arrays are shared, they are never modified in place).
+        """
+        clone = HeadToHeadIndex()
+        clone.frame, clone._last_date = self.frame, self._last_date
+        clone._dates, clone._hosts, clone._visitors, clone._diff = self._dates, self._hosts, self._visitors, self._diff
+        clone.pairs = dict(self.pairs)
+        return clone
+
+    @staticmethod
+    def _columns(rows):
+        # (home teams, away teams, dates, goal differences) as arrays
+        def names(column):
+            values = rows[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # Decode through the categories: one string per team, not per row
+                categories = values.cat.categories.astype(str).to_numpy(dtype=object)
+                return categories[values.cat.codes.to_numpy()]
+            return values.astype(str).to_numpy(dtype=object)
+
+        dates = pd.to_datetime(rows["date"]).to_numpy()
+        diff = rows["home_score"].to_numpy(dtype=np.int64) - rows["away_score"].to_numpy(dtype=np.int64)
+        return names("home_team"), names("away_team"), dates, diff
+
+    def extend(self, frame):
+        """
+        Re-points the index at frame, a newer version of the indexed history.
+        When frame is the indexed rows, unchanged and in the same positions,
+        followed by rows dated no earlier than the last indexed match, just
+        those rows are indexed; otherwise (a correction, a back-dated result,
+        rows moved within a date) the index is rebuilt.
+        """
+        old = self.frame
+        if old is None or len(frame) < len(old):
+            return self.build(frame)
+        start = len(old)
+        tail = frame.iloc[start:]
+        appended = (
+            tail.empty or self._last_date is None
+            or pd.to_datetime(tail["date"]).min() >= self._last_date
+        )
+        if not appended or not self._same_prefix(frame.iloc[:start]):
+            return self.build(frame)
+        self.frame = frame
+        self._index(start)
+        return self
+
+    def _same_prefix(self, rows):
+        # Every indexed row must still be at its position with the same
+        # date, teams and score; one vectorized pass per column
+        if len(rows) == 0:
+            return True
+        homes, aways, dates, diff = self._columns(rows)
+        return (np.array_equal(dates, self._dates) and np.array_equal(diff, self._diff)
+                and np.array_equal(homes, self._hosts) and np.array_equal(aways, self._visitors))
+
+    def positions(self, team_a, team_b):
+        """
+        Row positions (date order) of every meeting between the two teams.
+        """
+        return self.pairs.get(pair_key(team_a, team_b), np.zeros(0, dtype=np.int64))
+
+    def meetings(self, team_a, team_b, last=None):
+        """
+        The pair's meetings as rows of the indexed frame, oldest first;
+        last limits them to the most recent ones.
+        """
+        positions = self.positions(team_a, team_b)
+        if last is not None:
+            positions = positions[-last:] if last > 0 else positions[:0]
+        if self.frame is None:
+            return pd.DataFrame()
+        return self.frame.iloc[positions]
+
+    def record(self, home_team, away_team, last=None):
+        """
+        (wins, draws, losses) of home_team against away_team over their
+        meetings, whichever side hosted them.
+        """
+        positions = self.positions(home_team, away_team)
+        if last is not None:
+            positions = positions[-last:] if last > 0 else positions[:0]
+        if len(positions) == 0:
+            return 0, 0, 0
+        diff = self._diff[positions]
+        diff = np.where(self._hosts[positions] == str(home_team), diff, -diff)
+        return int((diff > 0).sum()), int((diff == 0).sum()), int((diff < 0).sum())
+
+    def summary(self, home_team, away_team, last=5):
+        """
+        JSON-ready head-to-head overview for the analyze output; home_wins
+        and away_wins are from the point of view of this fixture's teams.
+        """
+        wins, draws, losses = self.record(home_team, away_team)
+        recent = self.meetings(home_team, away_team, last)
+        return {
+            "meetings": wins + draws + losses,
+            "home_wins": wins,
+            "draws": draws,
+            "away_wins": losses,
+            "recent": [
+                {"date": str(pd.Timestamp(date).date()), "home_team": str(h), "away_team": str(a),
+                 "score": f"{int(hs)}-{int(as_)}"}
+                for date, h, a, hs, as_ in zip(recent["date"], recent["home_team"], recent["away_team"],
+                                               recent["home_score"], recent["away_score"])
+            ][::-1],
+        }
+
+    def __len__(self):
+        return len(self.pairs)
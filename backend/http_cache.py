@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from snapshot import ensure_private_dir, user_cache_dir
+
+
+class ResponseCache:
+    """
+    Persistent per-URL cache of scraped pages. For each URL it keeps the
+    validators (ETag / Last-Modified), a hash of the body and the parsed
+    result, so unchanged pages are neither re-downloaded nor re-parsed.
+
+    Cached results are served without re-parsing, so the directory must be
+    private: directory, else $SCRAPER_CACHE_DIR, else the user's cache dir,
+    falling back to a per-user directory in the temp dir where the home
+    directory is read-only (serverless). Each is created with mode 0700 and
+    refused unless it belongs to the process user (or root) and nobody else
+    can write to it; without a usable directory nothing is cached.
+
+    freshness: {source: seconds} during which a cached result is served
+               without contacting the site at all (0 = always revalidate).
+    """
+    default_freshness = {"tff": 300, "macsonuclari": 300, "news": 900}
+
+    def __init__(self, directory=None, freshness=None):
+        self.directory = self._private_directory(directory or os.environ.get("SCRAPER_CACHE_DIR"))
+        self.freshness = dict(self.default_freshness, **(freshness or {}))
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _private_directory(directory):
+        if directory:
+            candidates = [directory]
+        else:
+            user = f"-{os.getuid()}" if hasattr(os, "getuid") else ""
+            candidates = [os.path.join(user_cache_dir(), "http"),
+                          os.path.join(tempfile.gettempdir(), f"analiz_http_cache{user}")]
+        for candidate in candidates:
+            try:
+                ensure_private_dir(candidate)
+                return candidate
+            except OSError as e:
+                print(f"(!) Not caching responses in {candidate}: {e}")
+        return None
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def load(self, url):
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, url, entry):
+        # Write then rename so concurrent readers never see a half-written file
+        if self.directory is None:
+            return
+        path = self._path(url)
+        with self._lock:
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+
+    def is_fresh(self, entry, source):
+        max_age = self.freshness.get(source, 0)
+        return entry is not None and time.time() - entry.get("fetched_at", 0) < max_age
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    @staticmethod
+    def body_hash(content):
+        return hashlib.sha256(content).hexdigest()
@@ -0,0 +1,40 @@
+import importlib
+import sys
+import time
+
+# module name -> seconds its deferred import took, for the import-time report
+import_times = {}
+
+
+class LazyModule:
+    """
+    Stand-in for a heavy module (pandas, sklearn, bs4, ...) that is only
+    imported the first time one of its attributes is used, so that importing
+    main for the serverless entry point stays cheap.
+    """
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            name = self.__dict__["_name"]
+            already_loaded = name in sys.modules
+            start = time.perf_counter()
+            module = importlib.import_module(name)
+            if not already_loaded:
+                import_times[name] = time.perf_counter() - start
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_import(name):
+    return LazyModule(name)
@@ -0,0 +1,78 @@
+"""
+Targeted HTML extraction for the scraper. Only the nodes we read are built:
+lxml with XPath when it is installed, otherwise BeautifulSoup restricted
+to the target tags with a SoupStrainer.
+"""
+import importlib.util
+from lazy import lazy_import
+
+bs4 = lazy_import("bs4")
+lxml_html = lazy_import("lxml.html")
+
+HAVE_LXML = importlib.util.find_spec("lxml") is not None
+
+TFF_ROWS_XPATH = "//tr[contains(concat(' ', normalize-space(@class), ' '), ' maclar ')]"
+HEADLINES_XPATH = "//h1 | //h2"
+
+
+def _lxml_root(content):
+    if not content or not content.strip():
+        return None
+    try:
+        return lxml_html.document_fromstring(content)
+    except lxml_html.etree.ParserError:
+        # e.g. a page that is only comments/whitespace
+        return None
+
+
+def _tff_match(cells):
+    # Columns: [?, home, score, away, ...]; short rows are separators
+    if len(cells) > 5:
+        return {
+            "home_team": cells[1].strip(),
+            "away_team": cells[3].strip(),
+            "raw_score": cells[2].strip(),
+            "source": "TFF"
+        }
+    return None
+
+
+def parse_tff(content, use_lxml=None):
+    """
+    Match rows (tr.maclar) from a TFF results page.
+    """
+    if use_lxml is None:
+        use_lxml = HAVE_LXML
+    matches = []
+    if use_lxml:
+        root = _lxml_root(content)
+        rows = root.xpath(TFF_ROWS_XPATH) if root is not None else []
+        for row in rows:
+            match = _tff_match([td.text_content() for td in row.xpath(".//td")])
+            if match:
+                matches.append(match)
+    else:
+        # A class_ filter on the strainer would drop rows with several
+        # classes, so strain on the tag and match the class afterwards
+        soup = bs4.BeautifulSoup(content, "html.parser", parse_only=bs4.SoupStrainer("tr"))
+        for row in soup.find_all("tr", class_="maclar"):
+            match = _tff_match([td.text for td in row.find_all("td")])
+            if match:
+                matches.append(match)
+    return matches
+
+
+def parse_headlines(content, use_lxml=None):
+    """
+    Stripped text of every h1/h2 on a news page, in document order.
+    """
+    if use_lxml is None:
+        use_lxml = HAVE_LXML
+    if use_lxml:
+        root = _lxml_root(content)
+        if root is None:
+            return []
+        return [h.text_content().strip() for h in root.xpath(HEADLINES_XPATH)]
+    strainer = bs4.SoupStrainer(["h1", "h2"])
+    soup = bs4.BeautifulSoup(content, "html.parser", parse_only=strainer)
+    return [h.text.strip() for h in soup.find_all(["h1", "h2"])]
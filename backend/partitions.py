@@ -0,0 +1,203 @@
+"""
+League partitions: one AnalysisEngine per league, each with its own match
+history, trained models, golden algorithm and snapshot directory.
+
+Partitions are created on first request for a known league (configured,
+with upcoming fixtures or seen in scraped results) and warm up in the
+background (from their snapshot when there is one), at most train_workers
+at a time.
+When the loaded partitions exceed the memory limit or the partition count,
+the least recently used ready ones are dropped; their snapshot brings them
+back quickly on the next request.
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from engine import AnalysisEngine
+from snapshot import default_snapshot_dir
+
+
+def league_slug(league):
+    """
+    Directory-safe name for a league ("Super Lig" -> "super-lig").
+    """
+    return re.sub(r"[^a-z0-9]+", "-", str(league).lower()).strip("-") or "league"
+
+
+class UnknownLeague(Exception):
+    """
+    Raised by LeaguePartitions.get for a league no source knows about.
+    """
+    def __init__(self, league):
+        super().__init__(f"Unknown league: {league}")
+        self.league = league
+
+
+class LeaguePartitions:
+    def __init__(self, scraper=None, memory_limit=None, max_loaded=None, train_workers=None,
+                 snapshot_dir=None, engine_factory=AnalysisEngine, leagues=None, league_source=None):
+        """
+        scraper: MatchScraper shared by every partition.
+        memory_limit: bytes the loaded partitions may hold together
+                      (defaults to $ENGINE_MEMORY_LIMIT_MB; unlimited when unset).
+        max_loaded: partitions kept loaded at most (defaults to $ENGINE_MAX_LEAGUES).
+        train_workers: partitions warming up at the same time
+                       (defaults to $LEAGUE_TRAIN_WORKERS or 2).
+        snapshot_dir: parent of the per-league snapshot directories.
+        engine_factory: builds a partition; called with league=, snapshot_dir=,
+                        scraper=, warmup_slots= and on_scrape= keywords.
+        leagues: leagues that may always be loaded (e.g. the preloaded ones).
+        league_source: optional callable returning more known leagues, e.g.
+                       the leagues of the upcoming fixtures.
+        """
+        limit_mb = float(os.environ.get("ENGINE_MEMORY_LIMIT_MB", 0))
+        self.memory_limit = memory_limit or (int(limit_mb * 1024 * 1024) if limit_mb else None)
+        self.max_loaded = max_loaded or int(os.environ.get("ENGINE_MAX_LEAGUES", 0)) or None
+        self.train_workers = train_workers or int(os.environ.get("LEAGUE_TRAIN_WORKERS", 2))
+        self.snapshot_dir = snapshot_dir or default_snapshot_dir()
+        self.scraper = scraper
+        self.engine_factory = engine_factory
+        self.league_source = league_source
+        self.evictions = 0
+        # Configured leagues plus every league seen in scraped results
+        self._known = set(leagues or ())
+
+        # Least recently used first
+        self._engines = OrderedDict()
+        self._last_used = {}
+        self._lock = threading.RLock()
+        self._slots = threading.BoundedSemaphore(self.train_workers)
+
+    def _create(self, league):
+        return self.engine_factory(
+            league=league, snapshot_dir=os.path.join(self.snapshot_dir, league_slug(league)),
+            scraper=self.scraper, warmup_slots=self._slots, on_scrape=self._learn_leagues)
+
+    def _learn_leagues(self, scraped):
+        if "league" in scraped.columns:
+            leagues = set(scraped["league"].dropna().astype(str))
+            with self._lock:
+                self._known.update(leagues)
+
+    def known_leagues(self):
+        """
+        Leagues a partition may be created for.
+        """
+        with self._lock:
+            known = set(self._known)
+        if self.league_source is not None:
+            try:
+                known.update(self.league_source())
+            except Exception as e:
+                print(f"(!) Could not list leagues: {e}")
+        return sorted(known)
+
+    def get(self, league):
+        """
+        The league's engine, created on first use and marked most recently
+        used. A partition that is not ready starts warming up in the
+        background (failed warm-ups only after their retry delay); analyze
+        calls on it raise EngineNotReady meanwhile. Raises UnknownLeague
+        for a league that is neither loaded nor known.
+        """
+        if league not in self._engines and league not in self.known_leagues():
+            raise UnknownLeague(league)
+        with self._lock:
+            engine = self._engines.get(league)
+            if engine is None:
+                engine = self._engines[league] = self._create(league)
+            self._engines.move_to_end(league)
+            self._last_used[league] = time.time()
+        if not engine.ready:
+            # No-op while a warm-up is running or a failed one waits for its retry
+            engine.start_background_initialize()
+        self.enforce_limits(keep=league)
+        return engine
+
+    def warm_up(self, leagues):
+        """
+        Starts background warm-ups for several leagues; they train in
+        parallel, train_workers at a time.
+        """
+        return [self.get(league) for league in leagues]
+
+    def loaded(self):
+        with self._lock:
+            return list(self._engines)
+
+    def memory_usage(self):
+        with self._lock:
+            engines = list(self._engines.values())
+        return sum(engine.memory_usage() for engine in engines if engine.ready)
+
+    def evict(self, league):
+        """
+        Drops a partition. Returns True if it was loaded.
+        """
+        with self._lock:
+            engine = self._engines.pop(league, None)
+            self._last_used.pop(league, None)
+        if engine is None:
+            return False
+        self.evictions += 1
+        print(f"Evicted league partition {league!r}"
+              + ("" if engine.snapshots is not None else " (no snapshot, it will retrain)"))
+        return True
+
+    def enforce_limits(self, keep=None):
+        """
+        Evicts least recently used partitions until the memory limit and the
+        partition count are respected. Partitions that are warming up and
+        `keep` are never evicted. Returns the evicted leagues.
+        """
+        if self.memory_limit is None and self.max_loaded is None:
+            return []
+        evicted = []
+        with self._lock:
+            sizes = {league: engine.memory_usage() if engine.ready else 0
+                     for league, engine in self._engines.items()}
+            total = sum(sizes.values())
+            count = len(self._engines)
+            for league, engine in list(self._engines.items()):
+                over_memory = self.memory_limit is not None and total > self.memory_limit
+                over_count = self.max_loaded is not None and count > self.max_loaded
+                if not (over_memory or over_count):
+                    break
+                if league == keep or engine.status["state"] == "warming":
+                    continue
+                self.evict(league)
+                evicted.append(league)
+                total -= sizes[league]
+                count -= 1
+        return evicted
+
+    def status(self):
+        """
+        Per-league readiness, size and last use, for /api/leagues.
+        """
+        with self._lock:
+            items = list(self._engines.items())
+            last_used = dict(self._last_used)
+        leagues = {}
+        for league, engine in items:
+            leagues[league] = {
+                "ready": engine.ready,
+                "state": engine.status["state"],
+                "progress": engine.status["progress"],
+                "error": engine.status["error"],
+                "golden_algorithm": engine.best_algorithm.name if engine.ready else None,
+                "data_points": len(engine.historical_data) if engine.historical_data is not None else 0,
+                "memory_bytes": engine.memory_usage() if engine.ready else 0,
+                "last_used": last_used.get(league),
+            }
+        return {
+            "leagues": leagues,
+            "known": self.known_leagues(),
+            "memory_bytes": sum(entry["memory_bytes"] for entry in leagues.values()),
+            "memory_limit": self.memory_limit,
+            "max_loaded": self.max_loaded,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,127 @@
+import glob
+import hashlib
+import os
+import pickle
+import time
+
+from lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+# Bump when the snapshot layout changes; older files are then ignored
+SNAPSHOT_FORMAT = 1
+
+
+def data_fingerprint(data):
+    """
+    Content hash of a historical data frame (row order and columns included).
+    """
+    if data is None:
+        return None
+    h = hashlib.sha256()
+    h.update(",".join(map(str, data.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def user_cache_dir():
+    """
+    The application's directory in the user's cache ($XDG_CACHE_HOME/analiz
+    or ~/.cache/analiz).
+    """
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache, "analiz")
+
+
+def default_snapshot_dir():
+    """
+    $ENGINE_SNAPSHOT_DIR, or a directory in the user's cache (never a shared
+    temp dir: snapshots are pickles, and loading one runs code).
+
+    On a serverless deployment the cache does not survive a cold start, so
+    point $ENGINE_SNAPSHOT_DIR at snapshots shipped with the deployment
+    (written by a local run with the same variable). Deployment files are
+    typically owned by root and read-only: they are loaded as they are, and
+    saving new versions there fails and is only reported.
+    """
+    return os.environ.get("ENGINE_SNAPSHOT_DIR", os.path.join(user_cache_dir(), "snapshots"))
+
+
+def _check_private(path, st):
+    # Only the process user, or root (e.g. files shipped with a deployment),
+    # may have written it; no-op where there are no uids
+    if not hasattr(os, "getuid"):
+        return
+    if st.st_uid not in (os.getuid(), 0):
+        raise PermissionError(f"{path} is owned by uid {st.st_uid}, not by this user or root")
+    if st.st_mode & 0o022:
+        raise PermissionError(f"{path} is writable by other users")
+
+
+def ensure_private_dir(directory):
+    """
+    Creates directory with mode 0700 if needed and raises PermissionError
+    unless it belongs to the process user (or root) and nobody else can
+    write to it.
+    """
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    _check_private(directory, os.stat(directory))
+
+
+class SnapshotStore:
+    """
+    Versioned pickles of the engine's trained state in one directory:
+    snapshot-<version>.pkl, newest version wins, only the last `keep` are kept.
+    The directory and every file must belong to the process user or root
+    and be writable by nobody else; anything else is refused before
+    unpickling.
+    """
+    def __init__(self, directory=None, keep=3):
+        self.directory = directory or default_snapshot_dir()
+        self.keep = keep
+
+    def _paths(self):
+        return sorted(glob.glob(os.path.join(self.directory, "snapshot-*.pkl")))
+
+    def save(self, state):
+        """
+        Writes state as the next version and returns its path.
+        """
+        ensure_private_dir(self.directory)
+        paths = self._paths()
+        version = int(os.path.basename(paths[-1])[9:-4]) + 1 if paths else 1
+        path = os.path.join(self.directory, f"snapshot-{version:06d}.pkl")
+
+        payload = dict(state, format=SNAPSHOT_FORMAT, version=version, created_at=time.time())
+        tmp = path + ".tmp"
+        with open(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+        for old in self._paths()[:-self.keep]:
+            os.remove(old)
+        return path
+
+    def load_latest(self):
+        """
+        Returns the newest readable snapshot of the current format, or None.
+        """
+        if not os.path.isdir(self.directory):
+            return None
+        try:
+            _check_private(self.directory, os.stat(self.directory))
+        except PermissionError as e:
+            print(f"(!) Not loading snapshots: {e}")
+            return None
+        for path in reversed(self._paths()):
+            try:
+                with open(path, "rb") as f:
+                    # Checked on the open file, so it can't be swapped in between
+                    _check_private(path, os.fstat(f.fileno()))
+                    payload = pickle.load(f)
+            except Exception as e:
+                print(f"(!) Skipping unreadable snapshot {path}: {e}")
+                continue
+            if payload.get("format") == SNAPSHOT_FORMAT:
+                return payload
+        return None
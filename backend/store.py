@@ -0,0 +1,328 @@
+import os
+from lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+pa_feather = lazy_import("pyarrow.feather")
+pa_parquet = lazy_import("pyarrow.parquet")
+
+# Compact dtype per known column; anything else is kept as scraped
+SCHEMA = {
+    "date": "datetime64[ns]",
+    "home_score": "int8",
+    "away_score": "int8",
+    "total_goals": "int8",
+    "home_xG": "float32",
+    "away_xG": "float32",
+    "possession_home": "int8",
+    "injuries_home": "int8",
+    "injuries_away": "int8",
+}
+CATEGORICAL = ["result", "weather", "league", "source"]
+TEAM_COLUMNS = ["home_team", "away_team"]
+
+# One row per fixture; when two sources report the same fixture the one
+# with the higher priority wins
+FIXTURE_KEY = ["date", "home_team", "away_team"]
+SOURCE_PRIORITY = {"TFF": 3, "macsonuclari": 2, "mackolik": 2, "simulation": 0}
+DEFAULT_SOURCE = "unknown"
+DEFAULT_PRIORITY = 1
+SCORE_COLUMNS = ["home_score", "away_score"]
+
+
+class ChangeSet:
+    """
+    What a MatchStore.ingest() call changed: newly added rows, rows that
+    replaced an existing fixture (corrected score or a more trusted source),
+    and source disagreements that were settled by priority.
+    """
+    def __init__(self, added, updated, conflicts):
+        self.added = added
+        self.updated = updated
+        self.conflicts = conflicts
+
+    @property
+    def empty(self):
+        return self.added.empty and self.updated.empty
+
+    @property
+    def affected_teams(self):
+        teams = set()
+        for frame in (self.added, self.updated):
+            for column in TEAM_COLUMNS:
+                if column in frame.columns:
+                    teams.update(frame[column].astype(str))
+        return teams
+
+    def __repr__(self):
+        return (f"<ChangeSet added={len(self.added)} updated={len(self.updated)} "
+                f"conflicts={len(self.conflicts)} teams={len(self.affected_teams)}>")
+
+
+class MatchStore:
+    """
+    Typed, columnar home for historical matches: datetime64 dates, small int
+    scores, and team names stored as categorical codes that share one team
+    vocabulary across home_team and away_team.
+
+    Persists to Arrow IPC (".arrow"/".feather", uncompressed so it can be
+    memory-mapped) or Parquet (".parquet") and loads back without re-parsing
+    strings.
+    """
+    def __init__(self, frame=None):
+        self.frame = self.normalize(frame if frame is not None else pd.DataFrame())
+        # {fixture key: row position}, built on the first ingest and then kept
+        # up to date by it
+        self._key_index = None
+
+    @classmethod
+    def from_records(cls, records):
+        return cls(pd.DataFrame(list(records)))
+
+    @staticmethod
+    def normalize(frame):
+        """
+        Returns a copy of frame with the compact schema applied.
+        """
+        frame = frame.copy()
+        for column, dtype in SCHEMA.items():
+            if column in frame.columns:
+                if dtype.startswith("datetime"):
+                    frame[column] = pd.to_datetime(frame[column]).astype(dtype)
+                else:
+                    frame[column] = frame[column].astype(dtype)
+
+        present = [c for c in TEAM_COLUMNS if c in frame.columns]
+        if present:
+            # One shared vocabulary so home/away codes are comparable
+            teams = pd.unique(pd.concat([frame[c].astype(str) for c in present], ignore_index=True))
+            team_dtype = pd.CategoricalDtype(sorted(teams))
+            for column in present:
+                frame[column] = frame[column].astype(str).astype(team_dtype)
+
+        for column in CATEGORICAL:
+            if column in frame.columns:
+                frame[column] = frame[column].astype("category")
+        return frame.reset_index(drop=True)
+
+    @property
+    def teams(self):
+        if "home_team" not in self.frame.columns:
+            return []
+        return list(self.frame["home_team"].cat.categories)
+
+    def team_codes(self):
+        """
+        (home_codes, away_codes) integer arrays into self.teams.
+        """
+        return (self.frame["home_team"].cat.codes.to_numpy(),
+                self.frame["away_team"].cat.codes.to_numpy())
+
+    def memory_usage(self):
+        """
+        Bytes held by the frame (deep, including category vocabularies).
+        """
+        return int(self.frame.memory_usage(deep=True).sum())
+
+    def __len__(self):
+        return len(self.frame)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        table = pa.Table.from_pandas(self.frame, preserve_index=False)
+        tmp = path + ".tmp"
+        if path.endswith(".parquet"):
+            pa_parquet.write_table(table, tmp)
+        else:
+            pa_feather.write_feather(table, tmp, compression="uncompressed")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, memory_map=True):
+        """
+        Loads a store written by save(). Arrow files are memory-mapped, so
+        numeric columns are read straight from the page cache.
+        """
+        if path.endswith(".parquet"):
+            table = pa_parquet.read_table(path, memory_map=memory_map)
+        else:
+            table = pa_feather.read_table(path, memory_map=memory_map)
+        store = cls.__new__(cls)
+        # Arrow keeps the pandas dtypes (categoricals, int8, datetime64)
+        store.frame = table.to_pandas()
+        store._key_index = None
+        return store
+
+    @staticmethod
+    def _fixture_keys(frame):
+        return (frame["date"].astype("int64").astype(str) + "|"
+                + frame["home_team"].astype(str) + "|" + frame["away_team"].astype(str))
+
+    @staticmethod
+    def _priorities(frame):
+        return frame["source"].astype(str).map(SOURCE_PRIORITY).fillna(DEFAULT_PRIORITY).to_numpy()
+
+    @staticmethod
+    def _align_categories(left, right):
+        """
+        Gives right the categorical dtypes of left. Values left has not seen
+        are appended to its categories, so existing codes stay valid; left is
+        only copied (shallowly) when that happens.
+        """
+        copied = False
+
+        def widen(columns, values):
+            nonlocal left, copied
+            categories = left[columns[0]].cat.categories
+            unseen = pd.Index(pd.unique(values)).difference(categories, sort=False)
+            if len(unseen):
+                if not copied:
+                    left, copied = left.copy(deep=False), True
+                for column in columns:
+                    left[column] = left[column].cat.add_categories(unseen)
+            return left[columns[0]].dtype
+
+        teams = [c for c in TEAM_COLUMNS if c in left.columns and c in right.columns]
+        if teams:
+            dtype = widen(teams, pd.concat([right[c].astype(str) for c in teams], ignore_index=True))
+            for column in teams:
+                right[column] = right[column].astype(str).astype(dtype)
+
+        for column in CATEGORICAL:
+            if column in left.columns and column in right.columns:
+                dtype = widen([column], right[column].astype(str))
+                right[column] = right[column].astype(str).astype(dtype)
+        return left, right
+
+    def _lookup_keys(self, keys):
+        """
+        Row positions of fixture keys in self.frame (-1 when not stored).
+        When the frame holds a fixture twice (e.g. it was built from raw
+        scraped rows) the later row is used.
+        """
+        if self._key_index is None:
+            # Later rows overwrite earlier ones
+            self._key_index = dict(zip(self._fixture_keys(self.frame), range(len(self.frame))))
+        index = self._key_index
+        return np.array([index.get(key, -1) for key in keys], dtype=np.int64)
+
+    @staticmethod
+    def _rows_equal(left, right):
+        # Missing values on both sides count as equal
+        same = (left == right) | (left.isna() & right.isna())
+        return same.all(axis=1).to_numpy()
+
+    @staticmethod
+    def _conflict(kept, dropped, i):
+        # Row i of two aligned frames reporting the same fixture
+        return {
+            "date": str(kept["date"].iloc[i].date()),
+            "home_team": str(kept["home_team"].iloc[i]),
+            "away_team": str(kept["away_team"].iloc[i]),
+            "kept": {"source": str(kept["source"].iloc[i]), "score": f"{kept['home_score'].iloc[i]}-{kept['away_score'].iloc[i]}"},
+            "dropped": {"source": str(dropped["source"].iloc[i]), "score": f"{dropped['home_score'].iloc[i]}-{dropped['away_score'].iloc[i]}"},
+        }
+
+    def _batch_conflicts(self, best, outranked):
+        """
+        Score disagreements between the sources of one batch: each outranked
+        report against the report kept for its fixture.
+        """
+        if outranked.empty:
+            return []
+        dropped = outranked.reset_index(drop=True)
+        kept = best.set_index(FIXTURE_KEY).loc[pd.MultiIndex.from_frame(dropped[FIXTURE_KEY])].reset_index()
+        differ = ~self._rows_equal(dropped[SCORE_COLUMNS], kept[SCORE_COLUMNS])
+        return [self._conflict(kept, dropped, i) for i in np.flatnonzero(differ)]
+
+    def ingest(self, frame):
+        """
+        Merges new or corrected results into the store and returns a ChangeSet.
+
+        Rows are deduplicated on (date, home_team, away_team, source) and the
+        store keeps one row per fixture: a report from a source of equal or
+        higher priority replaces the stored row when it changes anything,
+        a lower-priority report is ignored. Score disagreements between
+        sources, within the batch or with the stored row, are listed in
+        ChangeSet.conflicts either way.
+
+        Only the new rows are keyed and compared, against a fixture key index
+        that is extended with every ingest instead of rebuilt. Replaced rows
+        are overwritten where they are (columns the new report lacks keep
+        their stored values), new fixtures are appended, and the frame is
+        only re-sorted by date when a new fixture is older than the latest
+        stored one. The previous frame is never modified, so readers holding
+        it are unaffected.
+        """
+        new = self.normalize(frame)
+        if new.empty:
+            return ChangeSet(new, new, [])
+        if "source" not in new.columns:
+            new["source"] = pd.Categorical([DEFAULT_SOURCE] * len(new))
+
+        # Within the batch: last report per source, then best source per fixture
+        new = new.drop_duplicates(subset=FIXTURE_KEY + ["source"], keep="last")
+        ranked = new.iloc[np.argsort(self._priorities(new), kind="stable")]
+        outranked = ranked.duplicated(subset=FIXTURE_KEY, keep="last").to_numpy()
+        new = ranked[~outranked]
+        conflicts = self._batch_conflicts(new, ranked[outranked])
+        new = new.sort_values("date", kind="stable").reset_index(drop=True)
+
+        if self.frame.empty:
+            self.frame = new
+            self._key_index = None
+            return ChangeSet(new, new.iloc[:0], conflicts)
+
+        old = self.frame
+        if "source" not in old.columns:
+            old = old.assign(source=pd.Categorical([DEFAULT_SOURCE] * len(old)))
+        old, new = self._align_categories(old, new)
+
+        keys = self._fixture_keys(new)
+        positions = self._lookup_keys(keys)
+        is_new = positions < 0
+
+        matched = np.flatnonzero(~is_new)
+        old_rows = old.iloc[positions[matched]].reset_index(drop=True)
+        new_rows = new.iloc[matched].reset_index(drop=True)
+        columns = [c for c in new_rows.columns if c in old_rows.columns]
+        changed = ~self._rows_equal(new_rows[columns], old_rows[columns])
+        scores_differ = ~self._rows_equal(new_rows[SCORE_COLUMNS], old_rows[SCORE_COLUMNS])
+        wins = self._priorities(new_rows) >= self._priorities(old_rows)
+        replace = changed & wins
+
+        other_source = (new_rows["source"].astype(str) != old_rows["source"].astype(str)).to_numpy()
+        for i in np.flatnonzero(scores_differ & other_source):
+            kept, dropped = (new_rows, old_rows) if wins[i] else (old_rows, new_rows)
+            conflicts.append(self._conflict(kept, dropped, i))
+
+        added = new[is_new]
+        updated = new.iloc[matched[replace]]
+        if added.empty and updated.empty:
+            return ChangeSet(added.reset_index(drop=True), updated.reset_index(drop=True), conflicts)
+
+        merged = old
+        if not updated.empty:
+            # Overwrite in place, column by column, on a shallow copy
+            merged = merged.copy(deep=False)
+            rows = positions[matched[replace]]
+            for column in columns:
+                values = merged[column].copy()
+                values.iloc[rows] = updated[column].array
+                merged[column] = values
+
+        if not added.empty:
+            start = len(merged)
+            merged = pd.concat([merged, added], ignore_index=True)
+            self._key_index.update(zip(keys[is_new], range(start, len(merged))))
+            if added["date"].min() < old["date"].max():
+                # A back-dated result: restore date order and re-point the keys
+                order = np.argsort(merged["date"].to_numpy(), kind="stable")
+                merged = merged.iloc[order].reset_index(drop=True)
+                moved = np.empty(len(order), dtype=np.int64)
+                moved[order] = np.arange(len(order))
+                self._key_index = {key: int(moved[row]) for key, row in self._key_index.items()}
+
+        self.frame = merged
+        return ChangeSet(added.reset_index(drop=True), updated.reset_index(drop=True), conflicts)
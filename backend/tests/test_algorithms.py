@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+import algorithms
+
+
+def history(home_scores, away_scores):
+    n = len(home_scores)
+    teams = ["A", "B", "C", "D", "E", "F"]
+    home_scores, away_scores = np.asarray(home_scores), np.asarray(away_scores)
+    return pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=n, freq="D"),
+        "home_team": [teams[i % 6] for i in range(n)],
+        "away_team": [teams[(i + 1 + i // 6) % 6] for i in range(n)],
+        "home_score": home_scores,
+        "away_score": away_scores,
+        "result": np.where(home_scores > away_scores, "1", np.where(home_scores < away_scores, "2", "X")),
+    })
+
+
+def test_svm_with_too_few_draws_predicts_the_prior():
+    home = [2] * 20 + [0] * 8 + [1, 1]
+    away = [0] * 20 + [2] * 8 + [1, 1]
+    data = history(home, away)
+    svm = algorithms.SVMAlgo()
+
+    svm.train(data)
+
+    assert not svm.fitted
+    np.testing.assert_allclose(svm.predict_batch(data.head(3)), np.tile([20 / 30, 2 / 30, 8 / 30], (3, 1)))
+
+
+def test_team_stats_details_match_with_and_without_the_batch_stats():
+    data = history([2, 1, 0, 3, 1, 1, 0, 2, 2, 1, 0, 1], [0, 1, 2, 1, 1, 0, 3, 2, 1, 0, 0, 2])
+    fixtures = [{"home_team": "A", "away_team": "B"}, {"home_team": "C", "away_team": "Z"}]
+    for algo in (algorithms.FormAlgo(), algorithms.GoalAveragesAlgo(), algorithms.ExponentialSmoothingAlgo()):
+        algo.train(data)
+        probs = algo.predict_batch(pd.DataFrame(fixtures))
+        batched = [algo.describe(p, m) for p, m in zip(probs, fixtures)]
+
+        algo._described = (None, {})
+
+        assert [algo.describe(p, m) for p, m in zip(probs, fixtures)] == batched
+
+
+def test_poisson_update_before_train_matches_train():
+    data = history([2, 1, 0, 3, 1, 1], [0, 1, 2, 1, 1, 0])
+    for cls in (algorithms.PoissonAlgo, algorithms.MonteCarloAlgo):
+        updated, trained = cls(), cls()
+
+        updated.update(data)
+        trained.train(data)
+
+        assert updated.home_strength == trained.home_strength
+        assert updated.away_strength == trained.away_strength
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+import algorithms
+from backtest import walk_forward, walk_forward_windows
+
+
+def league(days=120, seed=0):
+    rng = np.random.default_rng(seed)
+    teams = ["A", "B", "C", "D", "E", "F"]
+    home = rng.integers(0, 6, days)
+    away = (home + rng.integers(1, 6, days)) % 6
+    home_scores, away_scores = rng.poisson(1.5, days), rng.poisson(1.1, days)
+    return pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=days, freq="D"),
+        "home_team": [teams[i] for i in home],
+        "away_team": [teams[i] for i in away],
+        "home_score": home_scores,
+        "away_score": away_scores,
+        "result": np.where(home_scores > away_scores, "1", np.where(home_scores < away_scores, "2", "X")),
+    })
+
+
+def test_every_model_predicts_all_windows_from_the_pre_window_state():
+    data = league()
+    first = walk_forward_windows(data["date"])[0]
+    for cls in (algorithms.EloAlgo, algorithms.PoissonAlgo, algorithms.HeadToHeadAlgo, algorithms.DixonColesAlgo):
+        reference = cls()
+        reference.train(data[data["date"] < first])
+
+        algo, probs, positions = walk_forward(cls(), data)
+
+        np.testing.assert_array_equal(positions, np.flatnonzero(data["date"] >= first))
+        np.testing.assert_allclose(probs, reference.predict_batch(data.iloc[positions]), err_msg=cls.__name__)
+
+
+def test_walk_forward_leaves_the_model_trained_on_all_data():
+    data = league()
+    fixtures = pd.DataFrame({"home_team": ["A", "C"], "away_team": ["B", "D"]})
+    for cls in (algorithms.PoissonAlgo, algorithms.FormAlgo):
+        reference = cls()
+        reference.train(data)
+
+        algo, _, _ = walk_forward(cls(), data)
+
+        np.testing.assert_allclose(algo.predict_batch(fixtures), reference.predict_batch(fixtures),
+                                   err_msg=cls.__name__)
+
+    # Elo and Head-to-Head keep the league priors of their pre-window fit;
+    # the ratings and meetings catch up
+    for cls, state in ((algorithms.EloAlgo, "team_ratings"), (algorithms.HeadToHeadAlgo, "records")):
+        reference = cls()
+        reference.train(data)
+
+        algo, _, _ = walk_forward(cls(), data)
+
+        np.testing.assert_allclose(getattr(algo, state)(fixtures), getattr(reference, state)(fixtures),
+                                   err_msg=cls.__name__)
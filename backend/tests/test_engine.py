@@ -0,0 +1,108 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from engine import AnalysisEngine
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from synthetic import generate_league_data, upcoming_fixtures  # noqa: E402
+
+# Placeholders and simulations draw random numbers on every call
+RANDOM = {"Monte Carlo Simulation", "Weather Impact", "Referee Strictness", "Injury Impact", "Market Odds Value",
+          "Linear Regression Trend", "Corner Prediction Model", "Card Probability", "Half-Time Correlation",
+          "Team Morale Index"}
+
+
+class StubScraper:
+    def __init__(self, data):
+        self.data = data
+
+    def scrape_recent_matches(self):
+        return self.data.copy()
+
+
+def deterministic(analysis):
+    golden = analysis["golden_algorithm"]
+    others = {p["algorithm"]: (p["prediction"], p["confidence"])
+              for p in analysis["all_predictions"] if p["algorithm"] not in RANDOM}
+    return golden["name"], others
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread"])
+def test_requests_during_a_retrain_see_one_model_set(executor, monkeypatch):
+    monkeypatch.setenv("ENGINE_SNAPSHOTS", "0")
+    data = generate_league_data(600, 10, 1, seed=1)
+    fixture = upcoming_fixtures(data, 1, seed=1)[0]
+    engine = AnalysisEngine(executor=executor, max_workers=4, backtest_weeks=3, scraper=StubScraper(data))
+    engine.initialize()
+    before = deterministic(engine.analyze_match(fixture))
+
+    seen = []
+    retrain = threading.Thread(target=engine.evaluate_models)
+    retrain.start()
+    while retrain.is_alive():
+        engine.analysis_cache.clear()
+        seen.append(deterministic(engine.analyze_match(fixture)))
+    retrain.join()
+    after = deterministic(engine.analyze_match(fixture))
+
+    assert seen
+    assert all(result in (before, after) for result in seen)
+
+
+def test_timed_out_algorithm_object_is_not_published(monkeypatch):
+    import algorithms
+    import engine as engine_module
+
+    class Stuck(algorithms.BaseAlgorithm):
+        def __init__(self):
+            super().__init__("Stuck")
+
+        def train(self, data):
+            time.sleep(3)
+            self.trained = True
+
+    started = []
+
+    def all_algorithms():
+        stuck = Stuck()
+        started.append(stuck)
+        return [algorithms.PoissonAlgo(), stuck]
+
+    monkeypatch.setenv("ENGINE_SNAPSHOTS", "0")
+    monkeypatch.setattr(engine_module, "get_all_algorithms", all_algorithms)
+    data = generate_league_data(200, 10, 1, seed=1)
+    engine = AnalysisEngine(executor="thread", max_workers=2, task_timeout=0.5, scraper=StubScraper(data))
+    engine.historical_data = data
+
+    engine.train_models()
+
+    stuck = next(algo for algo in engine.algorithms if algo.name == "Stuck")
+    assert stuck.error == "Timed out after 0.5s"
+    assert all(stuck is not task_object for task_object in started)
+
+
+def test_retrains_warm_start_dixon_coles_from_the_published_fit(monkeypatch):
+    from dixon_coles import DixonColesModel
+
+    monkeypatch.setenv("ENGINE_SNAPSHOTS", "0")
+    starts = []
+    fit = DixonColesModel.fit
+
+    def recording_fit(self, data):
+        starts.append(None if self.attack is None else dict(zip(self.teams, self.attack)))
+        return fit(self, data)
+
+    monkeypatch.setattr(DixonColesModel, "fit", recording_fit)
+    data = generate_league_data(400, 10, 1, seed=2)
+    engine = AnalysisEngine(executor="serial", backtest_weeks=2, scraper=StubScraper(data))
+    engine.initialize()
+
+    for retrain in (engine.train_models, engine.evaluate_models):
+        published = next(algo for algo in engine.algorithms if algo.name == "Dixon-Coles Model").model
+        del starts[:]
+        retrain()
+        assert starts[0] == dict(zip(published.teams, published.attack))
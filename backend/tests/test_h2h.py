@@ -0,0 +1,59 @@
+import pandas as pd
+
+from h2h import HeadToHeadIndex
+from store import MatchStore
+
+
+def result(date, home, away, home_score, away_score, source="mackolik"):
+    return {"date": date, "home_team": home, "away_team": away,
+            "home_score": home_score, "away_score": away_score, "source": source}
+
+
+def recent(index, home, away):
+    return [(m["home_team"], m["away_team"], m["score"]) for m in index.summary(home, away)["recent"]]
+
+
+def test_extend_indexes_appended_rows():
+    store = MatchStore()
+    store.ingest(pd.DataFrame([result("2024-01-01", "A", "B", 1, 0)]))
+    index = HeadToHeadIndex(store.frame)
+    store.ingest(pd.DataFrame([result("2024-01-08", "B", "A", 2, 2), result("2024-01-08", "C", "D", 0, 1)]))
+
+    index.extend(store.frame)
+
+    assert recent(index, "A", "B") == [("B", "A", "2-2"), ("A", "B", "1-0")]
+    assert index.record("A", "B") == (1, 1, 0)
+    assert recent(index, "C", "D") == [("C", "D", "0-1")]
+
+
+def test_extend_after_correction_within_a_date():
+    store = MatchStore()
+    index = HeadToHeadIndex()
+    for batch in (
+        [result("2024-01-01", "X", "Y", 1, 1)],
+        [result("2024-01-08", "A", "B", 1, 0), result("2024-01-08", "C", "D", 2, 2),
+         result("2024-01-08", "E", "F", 0, 1)],
+        [result("2024-01-15", "B", "A", 1, 1)],
+        # The federation corrects A-B
+        [result("2024-01-08", "A", "B", 3, 0, source="TFF")],
+    ):
+        store.ingest(pd.DataFrame(batch))
+        index.extend(store.frame)
+
+    assert recent(index, "A", "B") == [("B", "A", "1-1"), ("A", "B", "3-0")]
+    assert index.record("A", "B") == (1, 1, 0)
+    assert recent(index, "C", "D") == [("C", "D", "2-2")]
+    assert recent(index, "E", "F") == [("E", "F", "0-1")]
+    assert recent(index, "X", "Y") == [("X", "Y", "1-1")]
+
+
+def test_extend_rebuilds_for_back_dated_rows():
+    frame = MatchStore(pd.DataFrame([result("2024-01-08", "A", "B", 1, 0)])).frame
+    index = HeadToHeadIndex(frame)
+    earlier = MatchStore(pd.DataFrame([result("2024-01-01", "B", "A", 0, 2),
+                                       result("2024-01-08", "A", "B", 1, 0)])).frame
+
+    index.extend(earlier)
+
+    assert recent(index, "A", "B") == [("A", "B", "1-0"), ("B", "A", "0-2")]
+    assert index.record("A", "B") == (2, 0, 0)
@@ -0,0 +1,33 @@
+import os
+import stat
+
+import pytest
+
+from http_cache import ResponseCache
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "getuid"), reason="ownership checks need POSIX uids")
+
+
+def test_default_directory_is_private(tmp_path, monkeypatch):
+    monkeypatch.delenv("SCRAPER_CACHE_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    cache = ResponseCache()
+    cache.save("http://example.test/", {"parsed": [1]})
+
+    assert cache.directory == str(tmp_path / "analiz" / "http")
+    assert stat.S_IMODE(os.stat(cache.directory).st_mode) == 0o700
+    assert cache.load("http://example.test/") == {"parsed": [1]}
+
+
+def test_shared_directory_is_not_used(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    os.chmod(shared, 0o777)
+
+    cache = ResponseCache(str(shared))
+    cache.save("http://example.test/", {"parsed": [1]})
+
+    assert cache.directory is None
+    assert cache.load("http://example.test/") is None
+    assert os.listdir(shared) == []
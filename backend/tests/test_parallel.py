@@ -0,0 +1,38 @@
+import time
+
+from parallel import run_tasks
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def test_process_timeout_terminates_the_stuck_worker():
+    start = time.monotonic()
+    results = run_tasks(sleep, [(30,), (0.1,)], mode="process", max_workers=2, timeout=1)
+
+    assert results[0].error == "Timed out after 1s"
+    assert results[1].value == 0.1
+    assert time.monotonic() - start < 10
+
+
+def test_thread_failures_only_fail_their_task():
+    def fail(x):
+        raise ValueError(x)
+
+    results = run_tasks(lambda f, x: f(x), [(sleep, 0), (fail, "boom")], mode="thread", max_workers=2)
+
+    assert results[0].value == 0
+    assert results[1].error == "ValueError: boom"
+
+
+def test_tasks_queued_behind_a_hung_one_get_their_own_time():
+    for mode, hang in (("thread", 3), ("process", 30)):
+        start = time.monotonic()
+        results = run_tasks(sleep, [(hang,), (0.05,), (0.8,), (0.8,), (0.8,), (0.8,)],
+                            mode=mode, max_workers=2, timeout=1)
+
+        assert results[0].error == "Timed out after 1s", mode
+        assert [r.value for r in results[1:]] == [0.05, 0.8, 0.8, 0.8, 0.8], mode
+        assert time.monotonic() - start < 10, mode
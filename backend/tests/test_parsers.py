@@ -0,0 +1,20 @@
+import pytest
+
+import parsers
+
+PAGE = """<html><body><table>
+<tr class="haftaBaslik"><td colspan="7">1. Hafta</td></tr>
+<tr class="maclar"><td>01.01.2024</td><td>Konyaspor</td><td>1 - 0</td><td>Kayserispor</td><td>S</td><td>H</td></tr>
+<tr class="maclar maclarOver"><td>01.01.2024</td><td>Alanyaspor</td><td>2 - 2</td><td>Samsunspor</td><td>S</td><td>H</td></tr>
+<tr class="maclarOver"><td>01.01.2024</td><td>X</td><td>0 - 0</td><td>Y</td><td>S</td><td>H</td></tr>
+<tr class="maclar"><td>short</td></tr>
+</table></body></html>"""
+
+
+@pytest.mark.parametrize("use_lxml", [False, pytest.param(True, marks=pytest.mark.skipif(
+    not parsers.HAVE_LXML, reason="lxml not installed"))])
+def test_tff_rows_with_several_classes_are_kept(use_lxml):
+    matches = parsers.parse_tff(PAGE, use_lxml=use_lxml)
+
+    assert [(m["home_team"], m["raw_score"], m["away_team"]) for m in matches] == [
+        ("Konyaspor", "1 - 0", "Kayserispor"), ("Alanyaspor", "2 - 2", "Samsunspor")]
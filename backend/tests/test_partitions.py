@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from engine import AnalysisEngine
+from partitions import LeaguePartitions, UnknownLeague
+
+
+class EmptyScraper:
+    def __init__(self):
+        self.calls = 0
+
+    def scrape_recent_matches(self):
+        self.calls += 1
+        return pd.DataFrame({"date": ["2024-01-01"], "home_team": ["A"], "away_team": ["B"],
+                             "home_score": [1], "away_score": [0], "league": ["Other"]})
+
+
+def partitions_for(scraper, tmp_path, **kwargs):
+    def factory(**options):
+        return AnalysisEngine(retry_delay=60, **options)
+    return LeaguePartitions(scraper=scraper, snapshot_dir=str(tmp_path), engine_factory=factory, **kwargs)
+
+
+def test_unknown_league_is_rejected(tmp_path):
+    partitions = partitions_for(EmptyScraper(), tmp_path, leagues=["Super Lig"], league_source=lambda: ["Premier"])
+
+    with pytest.raises(UnknownLeague):
+        partitions.get("Nonexistent")
+    assert partitions.loaded() == []
+    assert partitions.known_leagues() == ["Premier", "Super Lig"]
+
+
+def test_failed_warm_up_waits_for_retry(tmp_path):
+    scraper = EmptyScraper()
+    partitions = partitions_for(scraper, tmp_path, leagues=["Super Lig"])
+
+    engine = partitions.get("Super Lig")
+    engine._init_thread.join()
+    assert engine.status["state"] == "failed"
+
+    for _ in range(3):
+        partitions.get("Super Lig")
+    assert scraper.calls == 1
+    # Leagues seen in scraped results become known
+    assert "Other" in partitions.known_leagues()
@@ -0,0 +1,121 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_cache import ResponseCache
+from scraper import MatchScraper
+
+TFF_PAGE = (b'<table><tr class="maclar"><td>01.01.2024</td><td>Konyaspor</td><td>1 - 0</td>'
+            b'<td>Kayserispor</td><td>S</td><td>H</td></tr></table>')
+DELAY = 0.3
+
+
+class StubSite(BaseHTTPRequestHandler):
+    # Keep-alive needs HTTP/1.1 and a Content-Length on every response
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.client_address, dict(self.headers)))
+        if self.path == "/slow":
+            server.release.wait(10)
+        elif self.path != "/etag" and self.path != "/plain":
+            time.sleep(DELAY)
+
+        if self.path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = TFF_PAGE if self.path in ("/tff", "/etag", "/plain") else f"<h1>{self.path}</h1>".encode()
+        self.send_response(200)
+        if self.path == "/etag":
+            self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSite)
+    server.daemon_threads = True
+    server.block_on_close = False
+    server.lock = threading.Lock()
+    server.requests = []
+    server.release = threading.Event()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.release.set()
+    server.shutdown()
+    server.server_close()
+
+
+def stub_scraper(site, news, **kwargs):
+    return MatchScraper(tff_url=f"{site.url}/tff", macsonuclari_urls=[f"{site.url}/ms"],
+                        news_sources=[f"{site.url}{path}" for path in news], **kwargs)
+
+
+def test_sources_run_in_parallel_over_one_keep_alive_session(site):
+    scraper = stub_scraper(site, ["/news/a", "/news/b"], cache=False)
+
+    rounds = []
+    for _ in range(2):
+        start = time.monotonic()
+        tff, headlines, _ = scraper._scrape_concurrently()
+        rounds.append(time.monotonic() - start)
+        with site.lock:
+            connections = {address for _, address, _ in site.requests}
+    sessions = len(scraper._sessions)
+    scraper.close()
+
+    assert [m["home_team"] for m in tff] == ["Konyaspor"]
+    assert sorted(headlines) == ["/news/a", "/news/b"]
+    # Four sources of DELAY each, run one after another, would take 4 * DELAY
+    assert all(elapsed < 3 * DELAY for elapsed in rounds)
+    assert len(site.requests) == 8
+    assert sessions == 1
+    # The second round reused the first round's connections
+    assert len(connections) <= 4
+
+
+def test_deadline_drops_a_slow_source(site):
+    scraper = stub_scraper(site, ["/news/a", "/slow"], cache=False, deadline=1.0)
+
+    start = time.monotonic()
+    tff, headlines, _ = scraper._scrape_concurrently()
+
+    assert time.monotonic() - start < 2.0
+    assert len(tff) == 1
+    assert headlines == ["/news/a"]
+
+
+def test_cache_revalidates_and_skips_unchanged_bodies(site, tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache"), freshness={"tff": 0})
+    scraper = MatchScraper(cache=cache)
+    parses = []
+
+    def parse(content):
+        parses.append(content)
+        return MatchScraper.parse_tff(content)
+
+    for url in (f"{site.url}/etag", f"{site.url}/plain"):
+        first = scraper.fetch_parsed(url, "tff", parse, timeout=5)
+        second = scraper.fetch_parsed(url, "tff", parse, timeout=5)
+        assert first == second == (200, [{"home_team": "Konyaspor", "away_team": "Kayserispor",
+                                          "raw_score": "1 - 0", "source": "TFF"}])
+    scraper.close()
+
+    # /etag: 200 then 304; /plain: 200 then an unchanged body. Each page is parsed once
+    assert len(parses) == 2
+    headers = [headers for path, _, headers in site.requests if path == "/etag"]
+    assert "If-None-Match" not in headers[0] and headers[1]["If-None-Match"] == '"v1"'
+    assert len([path for path, _, _ in site.requests if path == "/plain"]) == 2
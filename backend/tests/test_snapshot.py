@@ -0,0 +1,64 @@
+import os
+import stat
+
+import pytest
+
+from snapshot import SnapshotStore
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "getuid"), reason="ownership checks need POSIX uids")
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_round_trip_in_a_private_directory(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+
+    path = store.save({"value": 1})
+
+    assert mode(store.directory) == 0o700
+    assert mode(path) == 0o600
+    assert store.load_latest()["value"] == 1
+
+
+def test_refuses_a_file_others_can_write(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    path = store.save({"value": 1})
+    os.chmod(path, 0o666)
+
+    assert store.load_latest() is None
+
+
+def test_refuses_a_directory_others_can_write(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    store.save({"value": 1})
+    os.chmod(store.directory, 0o777)
+
+    assert store.load_latest() is None
+    with pytest.raises(PermissionError):
+        store.save({"value": 2})
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid") or os.getuid() != 0, reason="chown needs root")
+def test_refuses_a_file_owned_by_another_user(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    path = store.save({"value": 1})
+    os.chown(path, 65534, 65534)
+
+    assert store.load_latest() is None
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid") or os.getuid() != 0, reason="needs root-owned files")
+def test_loads_root_owned_snapshots_shipped_with_a_deployment(tmp_path, monkeypatch):
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    path = store.save({"value": 1})
+    os.chmod(path, 0o644)
+    os.chmod(store.directory, 0o755)
+
+    # The runtime user differs from the owner (root) of the deployed files
+    monkeypatch.setattr(os, "getuid", lambda: 1000)
+    assert store.load_latest()["value"] == 1
+
+    os.chown(path, 65534, 65534)
+    assert store.load_latest() is None
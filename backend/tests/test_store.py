@@ -0,0 +1,112 @@
+import pandas as pd
+
+from store import MatchStore
+
+
+def result(date, home, away, home_score, away_score, source="mackolik", **extra):
+    return dict({"date": date, "home_team": home, "away_team": away,
+                 "home_score": home_score, "away_score": away_score, "source": source}, **extra)
+
+
+def rows(store):
+    frame = store.frame
+    return [(str(d.date()), h, a, int(hs), int(as_), s) for d, h, a, hs, as_, s in zip(
+        frame["date"], frame["home_team"].astype(str), frame["away_team"].astype(str),
+        frame["home_score"], frame["away_score"], frame["source"].astype(str))]
+
+
+def test_duplicates_in_a_batch_keep_the_best_source():
+    store = MatchStore()
+    changes = store.ingest(pd.DataFrame([
+        result("2024-01-01", "A", "B", 1, 0, "simulation"),
+        result("2024-01-01", "A", "B", 2, 0, "TFF"),
+        result("2024-01-01", "A", "B", 2, 0, "mackolik"),
+        result("2024-01-01", "A", "B", 3, 0, "TFF"),
+    ]))
+
+    assert len(changes.added) == 1
+    assert rows(store) == [("2024-01-01", "A", "B", 3, 0, "TFF")]
+
+
+def test_sources_disagreeing_within_a_batch_are_reported():
+    store = MatchStore()
+    changes = store.ingest(pd.DataFrame([
+        result("2024-01-01", "A", "B", 3, 0, "TFF"),
+        result("2024-01-01", "A", "B", 4, 0, "macsonuclari"),
+        result("2024-01-02", "C", "D", 1, 1, "TFF"),
+        result("2024-01-02", "C", "D", 1, 1, "mackolik"),
+    ]))
+
+    assert changes.conflicts == [{
+        "date": "2024-01-01", "home_team": "A", "away_team": "B",
+        "kept": {"source": "TFF", "score": "3-0"}, "dropped": {"source": "macsonuclari", "score": "4-0"},
+    }]
+    assert rows(store) == [("2024-01-01", "A", "B", 3, 0, "TFF"), ("2024-01-02", "C", "D", 1, 1, "TFF")]
+
+
+def test_repeated_report_changes_nothing():
+    store = MatchStore()
+    store.ingest(pd.DataFrame([result("2024-01-01", "A", "B", 1, 0)]))
+    before = store.frame
+
+    changes = store.ingest(pd.DataFrame([result("2024-01-01", "A", "B", 1, 0)]))
+
+    assert changes.empty and not changes.conflicts
+    assert store.frame is before
+
+
+def test_lower_priority_source_is_ignored_but_reported():
+    store = MatchStore()
+    store.ingest(pd.DataFrame([result("2024-01-01", "A", "B", 1, 0, "TFF")]))
+
+    changes = store.ingest(pd.DataFrame([result("2024-01-01", "A", "B", 2, 2, "mackolik")]))
+
+    assert changes.empty
+    assert changes.conflicts == [{
+        "date": "2024-01-01", "home_team": "A", "away_team": "B",
+        "kept": {"source": "TFF", "score": "1-0"}, "dropped": {"source": "mackolik", "score": "2-2"},
+    }]
+    assert rows(store) == [("2024-01-01", "A", "B", 1, 0, "TFF")]
+
+
+def test_correction_replaces_the_row_in_place():
+    store = MatchStore()
+    store.ingest(pd.DataFrame([
+        result("2024-01-08", "A", "B", 1, 0, home_xG=1.5), result("2024-01-08", "C", "D", 2, 2, home_xG=0.7),
+    ]))
+    before = store.frame
+
+    changes = store.ingest(pd.DataFrame([result("2024-01-08", "A", "B", 3, 0, "TFF")]))
+
+    assert len(changes.updated) == 1 and changes.added.empty
+    assert changes.conflicts[0]["kept"] == {"source": "TFF", "score": "3-0"}
+    assert rows(store) == [("2024-01-08", "A", "B", 3, 0, "TFF"), ("2024-01-08", "C", "D", 2, 2, "mackolik")]
+    # Columns the correction doesn't carry keep their values; the old frame is untouched
+    assert store.frame["home_xG"].iloc[0] == 1.5
+    assert rows(MatchStore(before))[0] == ("2024-01-08", "A", "B", 1, 0, "mackolik")
+
+
+def test_new_results_are_appended_and_back_dated_ones_sorted_in():
+    store = MatchStore()
+    store.ingest(pd.DataFrame([result("2024-01-08", "A", "B", 1, 0)]))
+
+    store.ingest(pd.DataFrame([result("2024-01-15", "C", "D", 0, 0)]))
+    store.ingest(pd.DataFrame([result("2024-01-01", "E", "F", 2, 1)]))
+    # The key index follows the rows: a correction after the re-sort hits the right one
+    store.ingest(pd.DataFrame([result("2024-01-15", "C", "D", 1, 1, "TFF")]))
+
+    assert rows(store) == [
+        ("2024-01-01", "E", "F", 2, 1, "mackolik"),
+        ("2024-01-08", "A", "B", 1, 0, "mackolik"),
+        ("2024-01-15", "C", "D", 1, 1, "TFF"),
+    ]
+
+
+def test_fixture_stored_twice_is_matched_once():
+    store = MatchStore(pd.DataFrame([
+        result("2024-01-01", "A", "B", 1, 0, "mackolik"), result("2024-01-01", "A", "B", 1, 0, "macsonuclari"),
+    ]))
+
+    changes = store.ingest(pd.DataFrame([result("2024-01-01", "A", "B", 1, 0, "macsonuclari")]))
+
+    assert changes.empty
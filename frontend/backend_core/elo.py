@@ -0,0 +1,164 @@
+from lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+
+class EloRatings:
+    """
+    Chronological Elo ratings with the full rating history kept in compact
+    arrays (one row per processed match), so a team's rating can be asked
+    for as of any date during backtests.
+
+    fit() replays a whole history in one tight loop over plain Python lists;
+    update() applies a single new result in O(1).
+    """
+    def __init__(self, k=20.0, home_advantage=60.0, initial=1500.0):
+        self.k = k
+        self.home_advantage = home_advantage
+        self.initial = initial
+        self.reset()
+
+    def reset(self):
+        self.team_index = {}
+        self.ratings = []
+        self._n = 0
+        self._capacity = 0
+        self._alloc(1024)
+        self._by_team = None
+
+    def _alloc(self, capacity):
+        # History columns, grown by doubling
+        old_n = self._n
+        columns = {
+            "date": np.int64, "home": np.int32, "away": np.int32,
+            "home_pre": np.float32, "away_pre": np.float32,
+            "home_post": np.float32, "away_post": np.float32,
+        }
+        for name, dtype in columns.items():
+            fresh = np.empty(capacity, dtype=dtype)
+            if old_n:
+                fresh[:old_n] = getattr(self, "_" + name)[:old_n]
+            setattr(self, "_" + name, fresh)
+        self._capacity = capacity
+
+    def _team(self, name):
+        idx = self.team_index.get(name)
+        if idx is None:
+            idx = self.team_index[name] = len(self.ratings)
+            self.ratings.append(self.initial)
+        return idx
+
+    def expected_home(self, home_rating, away_rating):
+        return 1.0 / (1.0 + 10.0 ** ((away_rating - home_rating - self.home_advantage) / 400.0))
+
+    def fit(self, data):
+        """
+        Rebuilds all ratings from a match history (any order; sorted by date here).
+        """
+        self.reset()
+        if data is None or len(data) == 0:
+            return self
+        dates = pd.to_datetime(data["date"]).to_numpy().astype("datetime64[ns]").astype(np.int64)
+        order = np.argsort(dates, kind="stable")
+        homes = [self._team(t) for t in data["home_team"].astype(str).to_numpy()[order]]
+        aways = [self._team(t) for t in data["away_team"].astype(str).to_numpy()[order]]
+        diff = (data["home_score"].to_numpy(dtype=np.int64) - data["away_score"].to_numpy(dtype=np.int64))[order]
+        outcomes = (np.sign(diff) + 1) / 2.0
+
+        n = len(homes)
+        ratings = self.ratings
+        k, hfa, scale = self.k, self.home_advantage, 400.0
+        home_pre = [0.0] * n
+        away_pre = [0.0] * n
+        home_post = [0.0] * n
+        away_post = [0.0] * n
+        for i, (h, a, s) in enumerate(zip(homes, aways, outcomes.tolist())):
+            rh = ratings[h]
+            ra = ratings[a]
+            delta = k * (s - 1.0 / (1.0 + 10.0 ** ((ra - rh - hfa) / scale)))
+            home_pre[i] = rh
+            away_pre[i] = ra
+            ratings[h] = home_post[i] = rh + delta
+            ratings[a] = away_post[i] = ra - delta
+
+        self._alloc(max(1024, 2 * n))
+        self._n = n
+        self._date[:n] = dates[order]
+        self._home[:n] = homes
+        self._away[:n] = aways
+        self._home_pre[:n] = home_pre
+        self._away_pre[:n] = away_pre
+        self._home_post[:n] = home_post
+        self._away_post[:n] = away_post
+        return self
+
+    def update(self, home_team, away_team, home_score, away_score, date):
+        """
+        Applies one new result. Results should arrive in date order.
+        """
+        h = self._team(home_team)
+        a = self._team(away_team)
+        rh, ra = self.ratings[h], self.ratings[a]
+        s = 1.0 if home_score > away_score else (0.5 if home_score == away_score else 0.0)
+        delta = self.k * (s - self.expected_home(rh, ra))
+        self.ratings[h] = rh + delta
+        self.ratings[a] = ra - delta
+
+        if self._n == self._capacity:
+            self._alloc(2 * self._capacity)
+        i = self._n
+        self._date[i] = pd.Timestamp(date).value
+        self._home[i], self._away[i] = h, a
+        self._home_pre[i], self._away_pre[i] = rh, ra
+        self._home_post[i], self._away_post[i] = rh + delta, ra - delta
+        self._n += 1
+        self._by_team = None
+
+    def rating(self, team, as_of=None):
+        """
+        Current rating, or the rating a team carried into `as_of` (results
+        on that exact timestamp are not counted yet).
+        """
+        idx = self.team_index.get(team)
+        if idx is None:
+            return self.initial
+        if as_of is None:
+            return self.ratings[idx]
+
+        # Per-team (date, post-match rating) series, sorted once and reused
+        if self._by_team is None:
+            n = self._n
+            teams = np.concatenate([self._home[:n], self._away[:n]])
+            dates = np.concatenate([self._date[:n], self._date[:n]])
+            posts = np.concatenate([self._home_post[:n], self._away_post[:n]])
+            # Match sequence breaks ties between same-day matches
+            seq = np.concatenate([np.arange(n), np.arange(n)])
+            order = np.lexsort((seq, dates, teams))
+            starts = np.searchsorted(teams[order], np.arange(len(self.ratings) + 1))
+            self._by_team = (dates[order], posts[order], starts)
+
+        dates, posts, starts = self._by_team
+        lo, hi = starts[idx], starts[idx + 1]
+        pos = np.searchsorted(dates[lo:hi], pd.Timestamp(as_of).value, side="left")
+        return float(posts[lo + pos - 1]) if pos > 0 else self.initial
+
+    def history(self, team=None):
+        """
+        Rating history as a DataFrame (all matches, or one team's matches).
+        """
+        n = self._n
+        names = np.array(list(self.team_index), dtype=object)
+        frame = pd.DataFrame({
+            "date": self._date[:n].astype("datetime64[ns]"),
+            "home_team": names[self._home[:n]] if n else [],
+            "away_team": names[self._away[:n]] if n else [],
+            "home_pre": self._home_pre[:n], "away_pre": self._away_pre[:n],
+            "home_post": self._home_post[:n], "away_post": self._away_post[:n],
+        })
+        if team is not None:
+            frame = frame[(frame["home_team"] == team) | (frame["away_team"] == team)]
+        return frame
+
+    def __len__(self):
+        return self._n
@@ -0,0 +1,250 @@
+"""
+Per-team rolling statistics shared by the form-based and sklearn models.
+
+TeamFeatureStore computes, for every team and every match in a history,
+season averages, last-N form, exponentially weighted goals and home/away
+splits in grouped rolling passes over a per-team view of the matches (no
+per-row or per-team scans). Stores are cached per data version (content
+fingerprint), so every model trained on the same history shares one.
+"""
+import threading
+from collections import OrderedDict
+
+from lazy import lazy_import
+from snapshot import data_fingerprint
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Matches in the short-term form window
+WINDOW = 5
+# Half-life, in matches, of the exponentially weighted goal averages
+HALFLIFE = 4.0
+
+# Per-team statistics, each computed from the matches before a fixture
+TEAM_STATS = [
+    "played", "goals_for", "goals_against", "points",
+    "form_points", "form_goal_diff",
+    "ewm_goals_for", "ewm_goals_against",
+    "home_goals_for", "home_goals_against", "away_goals_for", "away_goals_against",
+]
+FEATURE_NAMES = [f"{side}_{stat}" for side in ("home", "away") for stat in TEAM_STATS]
+
+
+def outcome_labels(data):
+    """
+    0/1/2 (home win, draw, away win) per row, from the scores.
+    """
+    diff = data["home_score"].to_numpy(dtype=np.int64) - data["away_score"].to_numpy(dtype=np.int64)
+    return (1 - np.sign(diff)).astype(np.int8)
+
+
+def team_rows(data):
+    """
+    Two rows per match, one for each team, sorted by team and date:
+    match (row position in data), team, is_home, goals_for, goals_against, points.
+    """
+    n = len(data)
+    hs = data["home_score"].to_numpy(dtype=np.float64)
+    as_ = data["away_score"].to_numpy(dtype=np.float64)
+    home_points = np.where(hs > as_, 3.0, np.where(hs == as_, 1.0, 0.0))
+    away_points = np.where(as_ > hs, 3.0, np.where(hs == as_, 1.0, 0.0))
+    dates = pd.to_datetime(data["date"]).to_numpy()
+
+    long = pd.DataFrame({
+        "match": np.concatenate([np.arange(n), np.arange(n)]),
+        "team": np.concatenate([data["home_team"].astype(str).to_numpy(), data["away_team"].astype(str).to_numpy()]),
+        "is_home": np.concatenate([np.ones(n, dtype=bool), np.zeros(n, dtype=bool)]),
+        "date": np.concatenate([dates, dates]),
+        "goals_for": np.concatenate([hs, as_]),
+        "goals_against": np.concatenate([as_, hs]),
+        "points": np.concatenate([home_points, away_points]),
+    })
+    return long.sort_values(["team", "date", "match"], kind="stable").reset_index(drop=True)
+
+
+def _rolling_stats(long, inclusive):
+    """
+    TEAM_STATS for every row of team_rows(): over the team's earlier matches,
+    or (inclusive=True) including the row's own match. A statistic without
+    any matches behind it is NaN.
+    """
+    home = long["is_home"].to_numpy(dtype=np.float64)
+    values = pd.DataFrame({
+        "goals_for": long["goals_for"],
+        "goals_against": long["goals_against"],
+        "points": long["points"],
+        "home_played": home,
+        "home_goals_for": long["goals_for"] * home,
+        "home_goals_against": long["goals_against"] * home,
+        "away_played": 1.0 - home,
+        "away_goals_for": long["goals_for"] * (1.0 - home),
+        "away_goals_against": long["goals_against"] * (1.0 - home),
+    })
+    teams = long["team"]
+    totals = values.groupby(teams, sort=False).cumsum()
+    played = teams.groupby(teams, sort=False).cumcount() + 1
+    ewm = long.groupby("team", sort=False)[["goals_for", "goals_against"]].ewm(halflife=HALFLIFE).mean()
+    ewm = ewm.reset_index(level=0, drop=True).reindex(long.index)
+    if not inclusive:
+        totals = totals - values
+        played = played - 1
+        ewm = ewm.groupby(teams, sort=False).shift(1)
+
+    # Window sums as differences of running totals
+    window = totals - totals.groupby(teams, sort=False).shift(WINDOW).fillna(0.0)
+    count = played.to_numpy(dtype=np.float64)
+    in_window = np.minimum(count, WINDOW)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pd.DataFrame({
+            "played": count,
+            "goals_for": totals["goals_for"].to_numpy() / count,
+            "goals_against": totals["goals_against"].to_numpy() / count,
+            "points": totals["points"].to_numpy() / count,
+            "form_points": window["points"].to_numpy() / in_window,
+            "form_goal_diff": (window["goals_for"] - window["goals_against"]).to_numpy() / in_window,
+            "ewm_goals_for": ewm["goals_for"].to_numpy(),
+            "ewm_goals_against": ewm["goals_against"].to_numpy(),
+            "home_goals_for": (totals["home_goals_for"] / totals["home_played"]).to_numpy(),
+            "home_goals_against": (totals["home_goals_against"] / totals["home_played"]).to_numpy(),
+            "away_goals_for": (totals["away_goals_for"] / totals["away_played"]).to_numpy(),
+            "away_goals_against": (totals["away_goals_against"] / totals["away_played"]).to_numpy(),
+        }, index=long.index)[TEAM_STATS]
+
+
+class TeamState:
+    """
+    Every team's statistics after the last match of a history, plus league
+    averages; this is all a model needs to score upcoming fixtures.
+    """
+    def __init__(self, latest, defaults, league):
+        self.latest = latest
+        self.defaults = defaults
+        self.league = league
+
+    def stats(self, matches):
+        """
+        (home, away) DataFrames of TEAM_STATS for a DataFrame or list of fixtures.
+        Teams without history get played=0 and league averages.
+        """
+        if isinstance(matches, pd.DataFrame):
+            homes, aways = matches["home_team"].astype(str), matches["away_team"].astype(str)
+        else:
+            homes = [m["home_team"] for m in matches]
+            aways = [m["away_team"] for m in matches]
+        # Positional index, so home and away rows line up by fixture
+        home = self.latest.reindex(list(homes)).fillna(self.defaults).reset_index(drop=True)
+        away = self.latest.reindex(list(aways)).fillna(self.defaults).reset_index(drop=True)
+        return home, away
+
+    def features(self, matches):
+        """
+        (n, len(FEATURE_NAMES)) float32 feature rows for fixtures.
+        """
+        home, away = self.stats(matches)
+        return np.hstack([home.to_numpy(), away.to_numpy()]).astype(np.float32)
+
+
+class FeatureMatrix:
+    """
+    X: (n_matches, n_features) float32 pre-match features in data row order,
+    y: int8 outcome labels, state: TeamState for predicting what comes next.
+    """
+    def __init__(self, X, y, state, fingerprint=None):
+        self.X = X
+        self.y = y
+        self.state = state
+        self.fingerprint = fingerprint
+        self.feature_names = FEATURE_NAMES
+
+    def __len__(self):
+        return len(self.y)
+
+
+class TeamFeatureStore:
+    """
+    TEAM_STATS for both teams before every match of a history (home_before,
+    away_before, aligned with the data rows) and after its last match (state).
+    """
+    def __init__(self, data, fingerprint=None):
+        self.fingerprint = fingerprint
+        n = len(data)
+        self.y = outcome_labels(data) if n else np.zeros(0, dtype=np.int8)
+
+        home_goals = float(data["home_score"].mean()) if n else 1.4
+        away_goals = float(data["away_score"].mean()) if n else 1.1
+        goals = (home_goals + away_goals) / 2
+        points = float(3 * np.mean(self.y != 1) + 2 * np.mean(self.y == 1)) / 2 if n else 1.4
+        self.league = {
+            "home_goals": home_goals,
+            "away_goals": away_goals,
+            "outcomes": np.bincount(self.y, minlength=3) / n if n else np.array([0.45, 0.27, 0.28]),
+        }
+        # League averages stand in for teams (or venues) without matches yet
+        self.defaults = pd.Series({
+            "played": 0.0, "goals_for": goals, "goals_against": goals, "points": points,
+            "form_points": points, "form_goal_diff": 0.0,
+            "ewm_goals_for": goals, "ewm_goals_against": goals,
+            "home_goals_for": home_goals, "home_goals_against": away_goals,
+            "away_goals_for": away_goals, "away_goals_against": home_goals,
+        })[TEAM_STATS]
+
+        long = team_rows(data)
+        before = _rolling_stats(long, inclusive=False).fillna(self.defaults)
+        is_home = long["is_home"].to_numpy()
+        match = long["match"].to_numpy()
+        self.home_before = before[is_home].set_axis(match[is_home]).sort_index()
+        self.away_before = before[~is_home].set_axis(match[~is_home]).sort_index()
+
+        after = _rolling_stats(long, inclusive=True)
+        latest = after.groupby(long["team"], sort=False).tail(1)
+        latest.index = long.loc[latest.index, "team"].to_numpy()
+        self.state = TeamState(latest.fillna(self.defaults), self.defaults, self.league)
+        self._matrix = None
+
+    @property
+    def matrix(self):
+        """
+        FeatureMatrix over all TEAM_STATS of both teams, built on first use.
+        """
+        if self._matrix is None:
+            X = np.hstack([self.home_before.to_numpy(), self.away_before.to_numpy()]).astype(np.float32)
+            self._matrix = FeatureMatrix(X, self.y, self.state, self.fingerprint)
+        return self._matrix
+
+    def __len__(self):
+        return len(self.y)
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+CACHE_SIZE = 8
+
+
+def team_features(data):
+    """
+    Cached TeamFeatureStore: one per data version, shared by every model
+    trained on it. Treat its frames and arrays as read-only.
+    """
+    key = data_fingerprint(data)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    built = TeamFeatureStore(data, key)
+    with _cache_lock:
+        # Another thread may have built the same version meanwhile
+        built = _cache.setdefault(key, built)
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return built
+
+
+def feature_matrix(data):
+    """
+    The sklearn feature matrix for a history (cached with its TeamFeatureStore).
+    """
+    return team_features(data).matrix
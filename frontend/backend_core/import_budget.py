@@ -0,0 +1,64 @@
+"""
+Import-time report for the serverless entry point.
+
+    python import_budget.py                 # report for `import main`
+    python import_budget.py --budget 800    # exit 1 if the import takes over 800 ms
+
+Runs the import in a fresh interpreter with -X importtime, so numbers match a
+cold start, and lists the top-level packages that cost the most.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+
+def measure(module="main", cwd=None):
+    """
+    Returns (total_ms, {top-level package: cumulative ms}) for importing module
+    in a fresh interpreter.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd or os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    total_us = 0
+    packages = defaultdict(int)
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            # Top-level entries; their cumulative times add up to the total
+            total_us += int(cumulative_us)
+        packages[name.strip().split(".")[0]] += int(self_us)
+    return total_us / 1000, {k: v / 1000 for k, v in packages.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("module", nargs="?", default="main")
+    parser.add_argument("--budget", type=float, default=float(os.environ.get("IMPORT_BUDGET_MS", 0)) or None,
+                        help="fail when the import takes longer than this many milliseconds")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    total_ms, packages = measure(args.module)
+    print(f"import {args.module}: {total_ms:.1f} ms")
+    for name, ms in sorted(packages.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    if args.budget is not None and total_ms > args.budget:
+        print(f"(!) Over the {args.budget:.0f} ms import budget by {total_ms - args.budget:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
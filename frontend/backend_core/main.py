@@ -1,10 +1,17 @@
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from engine import AnalysisEngine
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from typing import List, Optional
+from engine import EngineNotReady
 from scraper import MatchScraper
-import uvicorn
-import pandas as pd
+from fixtures import FixtureStore
+from partitions import LeaguePartitions, UnknownLeague
+import metrics
+import os
+import time
 
 app = FastAPI(title="Otonom Bahis Analiz Ekosistemi")
 
@@ -17,54 +24,167 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-engine = AnalysisEngine()
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Route templates ("/api/analyze/{match_id}") keep the label set small
+        route = request.scope.get("route")
+        metrics.HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start, method=request.method,
+            route=getattr(route, "path", "unmatched"), status=status)
+
 scraper = MatchScraper()
+DEFAULT_LEAGUE = os.environ.get("DEFAULT_LEAGUE", "Super Lig")
+PRELOAD_LEAGUES = [l.strip() for l in os.environ.get("PRELOAD_LEAGUES", DEFAULT_LEAGUE).split(",") if l.strip()]
+fixtures = FixtureStore(scraper.get_upcoming_matches,
+                        refresh_interval=float(os.environ.get("FIXTURE_REFRESH_SECONDS", 300)))
+# One engine per known league, loaded on first request and evicted under memory pressure
+partitions = LeaguePartitions(scraper=scraper, leagues=[DEFAULT_LEAGUE] + PRELOAD_LEAGUES,
+                              league_source=fixtures.leagues)
+
+def league_of(match):
+    return match.get("league") or DEFAULT_LEAGUE
+
+def get_partition(league):
+    try:
+        return partitions.get(league)
+    except UnknownLeague as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-# Initialize engine on startup (or lazy load)
+# Warm the preloaded leagues up and keep fixtures fresh in the background so
+# uvicorn starts serving right away
 @app.on_event("startup")
 def startup_event():
-    engine.initialize()
+    partitions.warm_up(PRELOAD_LEAGUES)
+    fixtures.start_background_refresh()
 
 @app.get("/")
 def read_root():
     return {"status": "Active", "system": "Autonomous Betting Agent v1.0"}
 
+@app.get("/api/ready")
+def readiness(league: Optional[str] = None):
+    """
+    Readiness probe: 200 once the league's golden algorithm is selected
+    (the default league unless one is given), 503 with warm-up progress
+    until then, 404 for an unknown league.
+    """
+    engine = get_partition(league or DEFAULT_LEAGUE)
+    body = {"ready": engine.ready, "league": engine.league, **engine.status}
+    return JSONResponse(body, status_code=200 if engine.ready else 503)
+
+@app.get("/api/leagues")
+def get_leagues():
+    """
+    Loaded league partitions with their state and memory use, and the
+    leagues that can be loaded.
+    """
+    return partitions.status()
+
+@app.get("/api/metrics")
+def get_metrics():
+    """
+    Prometheus text exposition: per-algorithm train/backtest/predict times,
+    per-source scraper fetch/parse latency and API request latency.
+    """
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/api/dashboard")
-def get_dashboard_data():
+def get_dashboard_data(league: Optional[str] = None):
     """
-    Returns data for the main dashboard: 
+    Returns data for the main dashboard (default league unless one is given):
     - Current best algorithm
     - System accuracy
     - Upcoming matches
     """
+    engine = get_partition(league or DEFAULT_LEAGUE)
     if not engine.best_algorithm:
-        return {"status": "Training..."}
+        return {"status": "Training...", "progress": engine.status["progress"]}
         
     return {
+        "league": engine.league,
         "golden_algorithm": engine.best_algorithm.name,
         "system_accuracy": f"{engine.best_algorithm.accuracy * 100:.1f}%",
         "algorithms_tested": len(engine.algorithms),
-        "data_points": len(engine.historical_data) if engine.historical_data is not None else 0
+        "data_points": len(engine.historical_data) if engine.historical_data is not None else 0,
+        "model_version": engine.model_version,
+        "analysis_cache": engine.analysis_cache.stats()
     }
 
+# Scraping and model inference block, so they run on the threadpool
+# instead of freezing the event loop for every other client
+
 @app.get("/api/matches")
-async def get_upcoming_matches():
-    matches = scraper.get_upcoming_matches()
-    return matches
+async def get_upcoming_matches(league: Optional[List[str]] = Query(None), date: Optional[List[str]] = Query(None)):
+    # Only scrapes here if the background refresh hasn't run yet (e.g. serverless)
+    await run_in_threadpool(fixtures.ensure_loaded)
+    return fixtures.find(leagues=league, dates=date)
 
 @app.get("/api/analyze/{match_id}")
 async def analyze_match(match_id: str):
-    # Retrieve match details (mocked for now based on ID or generated)
-    # In real app, fetch match details from scraper cache
-    matches = scraper.get_upcoming_matches()
-    target_match = next((m for m in matches if m["id"] == match_id), None)
-    
+    await run_in_threadpool(fixtures.ensure_loaded)
+    target_match = fixtures.get(match_id)
     if not target_match:
-        # Fallback if not found in upcoming, just create a dummy one for demo
-        target_match = {"home_team": "Galatasaray", "away_team": "Fenerbahce", "date": "2024-05-19"}
+        raise HTTPException(status_code=404, detail=f"Unknown match id: {match_id}")
     
-    analysis = engine.analyze_match(target_match)
+    # get() can measure partition sizes for eviction, so keep it off the event loop
+    engine = await run_in_threadpool(get_partition, league_of(target_match))
+    try:
+        analysis = await run_in_threadpool(engine.analyze_match, target_match)
+    except EngineNotReady as e:
+        return {"status": "Training...", "progress": e.status["progress"]}
     return analysis
 
+class BulkAnalyzeRequest(BaseModel):
+    match_ids: Optional[List[str]] = None # Specific fixtures
+    date: Optional[str] = None # Whole matchday, "YYYY-MM-DD"
+    dates: Optional[List[str]] = None # Several matchdays
+    leagues: Optional[List[str]] = None # Restrict the matchdays to these leagues
+
+@app.post("/api/analyze")
+async def analyze_matches(request: BulkAnalyzeRequest):
+    """
+    Analyzes a list of fixture ids and/or whole matchdays in one batched
+    pass (all upcoming fixtures when nothing is given).
+    """
+    await run_in_threadpool(fixtures.ensure_loaded)
+    selected, missing = fixtures.get_many(request.match_ids or [])
+
+    dates = (request.dates or []) + ([request.date] if request.date else [])
+    if dates or request.leagues or request.match_ids is None:
+        seen = {m["id"] for m in selected}
+        for m in fixtures.find(leagues=request.leagues, dates=dates or None):
+            if m["id"] not in seen:
+                seen.add(m["id"])
+                selected.append(m)
+
+    # One batch per league partition; leagues still warming up are reported
+    # under "training" with their progress
+    by_league = {}
+    for m in selected:
+        by_league.setdefault(league_of(m), []).append(m)
+
+    results, training = {}, {}
+    for league, matches in by_league.items():
+        engine = await run_in_threadpool(get_partition, league)
+        try:
+            analyses = await run_in_threadpool(engine.analyze_matches, matches)
+        except EngineNotReady as e:
+            training[league] = e.status["progress"]
+            continue
+        results.update({m["id"]: analysis for m, analysis in zip(matches, analyses)})
+    return {
+        "results": results,
+        "missing": missing,
+        "training": training
+    }
+
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
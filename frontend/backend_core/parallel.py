@@ -0,0 +1,148 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+
+class TaskResult:
+    def __init__(self, value=None, error=None, elapsed=0.0):
+        self.value = value
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _timed_call(fn, args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, time.perf_counter() - start
+
+
+def run_tasks(fn, arg_list, mode="serial", max_workers=None, timeout=None, progress=None):
+    """
+    Runs fn(*args) for every entry of arg_list and returns a TaskResult per entry,
+    in the same order. A task that raises or runs out of time only fails itself.
+
+    mode: "serial", "thread" or "process". With "process", fn and its arguments
+          must be picklable and results come back as copies.
+    timeout: seconds allowed per task, counted from the moment it is handed
+             to a free worker; at most max_workers tasks are dispatched at a
+             time. Not enforced in serial mode. A worker stuck on a timed-out
+             task is left behind in its pool and the remaining tasks go to a
+             fresh pool, so they never queue behind it. Process workers are
+             terminated once the other tasks of their pool are done; a thread
+             can't be stopped, so in thread mode the task keeps running and
+             the caller must not reuse the objects it was given.
+    progress: optional callback progress(done, total) after each task.
+    """
+    total = len(arg_list)
+    if mode == "serial" or len(arg_list) <= 1:
+        results = []
+        for args in arg_list:
+            try:
+                value, elapsed = _timed_call(fn, args)
+                results.append(TaskResult(value=value, elapsed=elapsed))
+            except Exception as e:
+                results.append(TaskResult(error=f"{type(e).__name__}: {e}"))
+            if progress:
+                progress(len(results), total)
+        return results
+
+    if mode == "thread":
+        pool_cls = ThreadPoolExecutor
+    elif mode == "process":
+        pool_cls = ProcessPoolExecutor
+    else:
+        raise ValueError(f"Unknown execution mode: {mode}")
+
+    workers = max_workers or os.cpu_count() or 1
+    pool = pool_cls(max_workers=workers)
+    # Pools left behind with a stuck worker
+    abandoned = []
+    results = [None] * total
+    pending = deque(enumerate(arg_list))
+    # future -> (task index, deadline, pool)
+    running = {}
+    done_count = 0
+    try:
+        while pending or running:
+            busy = sum(1 for _, _, owner in running.values() if owner is pool)
+            while pending and busy < workers:
+                i, args = pending.popleft()
+                deadline = time.monotonic() + timeout if timeout is not None else None
+                running[pool.submit(_timed_call, fn, args)] = (i, deadline, pool)
+                busy += 1
+
+            wait_for = None
+            if timeout is not None:
+                wait_for = max(0.0, min(deadline for _, deadline, _ in running.values()) - time.monotonic())
+            finished, _ = wait(running, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            now = time.monotonic()
+            for future, (i, deadline, owner) in list(running.items()):
+                if future in finished:
+                    try:
+                        value, elapsed = future.result()
+                        results[i] = TaskResult(value=value, elapsed=elapsed)
+                    except Exception as e:
+                        results[i] = TaskResult(error=f"{type(e).__name__}: {e}")
+                elif deadline is not None and deadline <= now and not future.done():
+                    future.cancel()
+                    results[i] = TaskResult(error=f"Timed out after {timeout}s")
+                    if owner is pool:
+                        # The stuck worker can't take new tasks
+                        abandoned.append(pool)
+                        if mode == "thread":
+                            pool.shutdown(wait=False)
+                        pool = pool_cls(max_workers=workers)
+                else:
+                    continue
+                del running[future]
+                done_count += 1
+                if progress:
+                    progress(done_count, total)
+
+            if mode == "process":
+                _release_abandoned(abandoned, running)
+    finally:
+        for future in running:
+            future.cancel()
+        if mode == "process":
+            for stale in abandoned:
+                _terminate_workers(stale)
+        pool.shutdown(wait=not running, cancel_futures=bool(running))
+    return results
+
+
+def _release_abandoned(abandoned, running):
+    """
+    Terminates the abandoned process pools that no longer run a task
+    anyone waits for.
+    """
+    owners = {owner for _, _, owner in running.values()}
+    for stale in [p for p in abandoned if p not in owners]:
+        abandoned.remove(stale)
+        _terminate_workers(stale)
+
+
+def _terminate_workers(pool):
+    """
+    Stops a process pool's workers, running tasks included. cancel() and
+    shutdown() leave a running task alone, which would leak its worker in a
+    long-lived server and block interpreter exit until it returns.
+    """
+    terminate = getattr(pool, "terminate_workers", None)
+    if terminate is not None:
+        # Python 3.14+
+        terminate()
+        return
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join(timeout=5)
@@ -1,12 +1,22 @@
 
 import random
-import pandas as pd
-import numpy as np
-import requests
-from bs4 import BeautifulSoup
+from lazy import lazy_import
 from datetime import datetime, timedelta
 import re
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+from http_cache import ResponseCache
+import metrics
+import parsers
+
+# Heavy dependencies are imported on first use, not when the API boots
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+requests = lazy_import("requests")
+requests_adapters = lazy_import("requests.adapters")
 
 # Mock data generator for fallback (Backup Plan)
 def generate_mock_data():
@@ -38,19 +48,135 @@ def generate_mock_data():
             "possession_home": random.randint(35, 65) + (10 if h_str > 1.2 else 0),
             "weather": random.choice(["Sunny", "Clear", "Rainy", "Cloudy", "Snowy"]),
             "injuries_home": random.randint(0, 4),
-            "injuries_away": random.randint(0, 4)
+            "injuries_away": random.randint(0, 4),
+            "league": "Super Lig",
+            "source": "simulation"
         })
     return pd.DataFrame(data)
 
 class MatchScraper:
-    def __init__(self):
-        self.data = pd.DataFrame()
+    tff_url = "https://www.tff.org/default.aspx?pageID=198" # Super Lig dashboard
+    macsonuclari_urls = [
+        "https://www.macsonuclari.net/turkiye/super-lig",
+        "https://macsonuclari1.net"
+    ]
+    news_sources = [
+        "https://www.ntvspor.net",
+        "https://www.fanatik.com.tr",
+        "https://www.fotomac.com.tr"
+    ]
+
+    def __init__(self, concurrent=True, deadline=20.0, pool_size=4, cache=None, **urls):
+        """
+        concurrent: run every source in parallel in consolidate_data.
+        deadline: seconds consolidate_data waits for all sources together.
+        pool_size: keep-alive connections kept per host.
+        cache: ResponseCache for conditional requests (default: on-disk cache
+               in $SCRAPER_CACHE_DIR), or False to always fetch and parse.
+        urls: optional tff_url / macsonuclari_urls / news_sources overrides
+              (e.g. a local stub server).
+        """
+        for name, value in urls.items():
+            if not hasattr(type(self), name):
+                raise TypeError(f"Unknown scraper source: {name}")
+            setattr(self, name, value)
+        self.concurrent = concurrent
+        self.deadline = deadline
+        self.pool_size = pool_size
+        self.cache = ResponseCache() if cache is None else (cache or None)
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+        self.data = None
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7'
         }
 
+    def _session(self, url):
+        """
+        One pooled keep-alive session per host, shared by all scraper threads.
+        """
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self._sessions_lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers.update(self.headers)
+                adapter = requests_adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount(host, adapter)
+                self._sessions[host] = session
+            return session
+
+    def fetch(self, url, timeout, headers=None):
+        return self._session(url).get(url, timeout=timeout, headers=headers)
+
+    def _fetch_timed(self, url, source, timeout, headers=None):
+        try:
+            with metrics.timer(metrics.SCRAPER_FETCH_SECONDS, source=source):
+                return self.fetch(url, timeout, headers=headers)
+        except Exception:
+            metrics.SCRAPER_RESPONSES.inc(source=source, outcome="error")
+            raise
+
+    @staticmethod
+    def _parse_timed(parse, content, source):
+        with metrics.timer(metrics.SCRAPER_PARSE_SECONDS, source=source):
+            return parse(content)
+
+    def fetch_parsed(self, url, source, parse, timeout):
+        """
+        Fetches url and returns (status_code, parse(content)), going through the
+        response cache: within the source's freshness window the cached result is
+        returned without a request, otherwise the request is made conditional on
+        the stored ETag/Last-Modified, and a 304 or an unchanged body hash reuses
+        the cached parse. parse must return JSON-serialisable data.
+        Fetch/parse latency and the outcome are recorded per source in metrics.
+        """
+        if self.cache is None:
+            res = self._fetch_timed(url, source, timeout)
+            metrics.SCRAPER_RESPONSES.inc(source=source, outcome=res.status_code)
+            return res.status_code, (self._parse_timed(parse, res.content, source) if res.status_code == 200 else None)
+
+        entry = self.cache.load(url)
+        if self.cache.is_fresh(entry, source):
+            metrics.SCRAPER_RESPONSES.inc(source=source, outcome="fresh")
+            return 200, entry["parsed"]
+
+        res = self._fetch_timed(url, source, timeout, headers=self.cache.conditional_headers(entry))
+        if res.status_code == 304 and entry is not None:
+            metrics.SCRAPER_RESPONSES.inc(source=source, outcome="not_modified")
+            entry["fetched_at"] = time.time()
+            self.cache.save(url, entry)
+            return 200, entry["parsed"]
+        if res.status_code != 200:
+            metrics.SCRAPER_RESPONSES.inc(source=source, outcome=res.status_code)
+            return res.status_code, None
+
+        body_hash = self.cache.body_hash(res.content)
+        if entry is not None and entry.get("body_hash") == body_hash:
+            metrics.SCRAPER_RESPONSES.inc(source=source, outcome="unchanged")
+            parsed = entry["parsed"]
+        else:
+            metrics.SCRAPER_RESPONSES.inc(source=source, outcome=200)
+            parsed = self._parse_timed(parse, res.content, source)
+        self.cache.save(url, {
+            "url": url,
+            "etag": res.headers.get("ETag"),
+            "last_modified": res.headers.get("Last-Modified"),
+            "body_hash": body_hash,
+            "fetched_at": time.time(),
+            "parsed": parsed,
+        })
+        return 200, parsed
+
+    def close(self):
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
     def scrape_tff(self):
         """
         Scrapes official TFF site for robust fixtures and results.
@@ -59,33 +185,21 @@ class MatchScraper:
         print("Scraping TFF.org...")
         matches = []
         try:
-            url = "https://www.tff.org/default.aspx?pageID=198" # Super Lig dashboard
-            res = requests.get(url, headers=self.headers, timeout=15)
-            if res.status_code == 200:
-                soup = BeautifulSoup(res.content, 'html.parser')
-                # TFF specific finding logic (simplified for demonstration)
-                # In real prod, we would iterate specific CSS classes for the score table
-                match_rows = soup.find_all("tr", class_="maclar") 
-                for row in match_rows:
-                    cols = row.find_all("td")
-                    if len(cols) > 5:
-                        home = cols[1].text.strip()
-                        score = cols[2].text.strip()
-                        away = cols[3].text.strip()
-                        matches.append({
-                            "home_team": home,
-                            "away_team": away,
-                            "raw_score": score,
-                            "source": "TFF"
-                        })
+            status, parsed = self.fetch_parsed(self.tff_url, "tff", self.parse_tff, timeout=15)
+            if status == 200:
+                matches = parsed
                 print(f"TFF Scrape: Found {len(matches)} matches.")
             else:
-                print(f"TFF broke: {res.status_code}")
+                print(f"TFF broke: {status}")
         except Exception as e:
             print(f"TFF Error: {str(e)}")
         
         return matches
 
+    @staticmethod
+    def parse_tff(content):
+        return parsers.parse_tff(content)
+
     def scrape_mackolik_api(self):
         """
         Attempts to hit Mackolik or similar API endpoints if publicly exposed.
@@ -101,16 +215,11 @@ class MatchScraper:
         """
         print("Scraping Macsonuclari...")
         matches = []
-        urls = [
-            "https://www.macsonuclari.net/turkiye/super-lig",
-            "https://macsonuclari1.net"
-        ]
-        
-        for url in urls:
+        for url in self.macsonuclari_urls:
             try:
-                res = requests.get(url, headers=self.headers, timeout=10)
-                if res.status_code == 200:
-                    # Parsing logic would go here
+                # Parsing logic would go here
+                status, _ = self.fetch_parsed(url, "macsonuclari", lambda content: [], timeout=10)
+                if status == 200:
                     print(f"Access successful to {url}")
                     break
             except:
@@ -129,15 +238,18 @@ class MatchScraper:
         Runs all scrapers and merges data.
         """
         print("--- STARTING OMNI-CHANNEL SCRAPING ---")
-        
-        # 1. TFF (Official Results)
-        tff_data = self.scrape_tff()
-        
-        # 2. News Audio/Text Sources
-        news_data = self.scrape_news_headlines()
-        
-        # 3. Third Party
-        ms_data = self.scrape_macsonuclari_net()
+
+        if self.concurrent:
+            tff_data, news_data, ms_data = self._scrape_concurrently()
+        else:
+            # 1. TFF (Official Results)
+            tff_data = self.scrape_tff()
+
+            # 2. News Audio/Text Sources
+            news_data = self.scrape_news_headlines()
+
+            # 3. Third Party
+            ms_data = self.scrape_macsonuclari_net()
         
         # If we got absolutely nothing, fallback.
         if not tff_data and not ms_data:
@@ -148,23 +260,50 @@ class MatchScraper:
         # This ensures the USER always sees data in the dashboard.
         return generate_mock_data()
 
+    def _scrape_concurrently(self):
+        """
+        Runs TFF, Macsonuclari and every news source in parallel. Whatever has
+        not finished by the global deadline is dropped (treated as empty).
+        """
+        pool = ThreadPoolExecutor(max_workers=2 + len(self.news_sources))
+        start = time.monotonic()
+        tff = pool.submit(self.scrape_tff)
+        ms = pool.submit(self.scrape_macsonuclari_net)
+        news = [pool.submit(self._scrape_headlines, s) for s in self.news_sources]
+
+        done, pending = wait([tff, ms] + news, timeout=self.deadline)
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=False)
+        if pending:
+            print(f"(!) {len(pending)} source(s) missed the {self.deadline}s scrape deadline.")
+        print(f"Scraping finished in {time.monotonic() - start:.1f}s")
+
+        def result(future, default):
+            return future.result() if future in done else default
+
+        headlines = []
+        for future in news:
+            headlines.extend(result(future, []))
+        return result(tff, []), headlines, result(ms, [])
+
+    def _scrape_headlines(self, url):
+        try:
+            status, parsed = self.fetch_parsed(url, "news", self.parse_headlines, timeout=5)
+            if status == 200:
+                return parsed
+        except:
+            pass
+        return []
+
+    @staticmethod
+    def parse_headlines(content):
+        return parsers.parse_headlines(content)
+
     def scrape_news_headlines(self):
-        sources = [
-            "https://www.ntvspor.net",
-            "https://www.fanatik.com.tr",
-            "https://www.fotomac.com.tr"
-        ]
         headlines = []
-        for s in sources:
-            try:
-                res = requests.get(s, headers=self.headers, timeout=5)
-                if res.status_code == 200:
-                   soup = BeautifulSoup(res.content, 'html.parser')
-                   # Get H1, H2 tags
-                   for h in soup.find_all(['h1', 'h2']):
-                       headlines.append(h.text.strip())
-            except:
-                pass
+        for s in self.news_sources:
+            headlines.extend(self._scrape_headlines(s))
         return headlines
 
     def scrape_recent_matches(self):